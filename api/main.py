@@ -25,9 +25,10 @@ ARCHITECTURE DECISIONS:
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 import sys
 import os
 
@@ -60,6 +61,11 @@ transaction_model = TransactionModel(db_manager)
 category_model = CategoryModel(db_manager)
 bank_account_model = BankAccountModel(db_manager)
 
+@app.on_event("shutdown")
+def close_database():
+    """Close the database connection, refreshing planner statistics first"""
+    db_manager.close()
+
 # Serve React frontend static files (for Docker deployment)
 frontend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "dist")
 if os.path.exists(frontend_path):
@@ -281,30 +287,31 @@ async def get_transactions(
         # Convert to response format with minimal processing
         transactions = []
         total_count = 0
-        for row in rows:
+        for (trans_id, date_str, account, account_name, description, withdrawal, deposit,
+             category_id, category_name, tax_type, is_tax_deductible, is_hidden,
+             is_matched, is_internal_transfer, row_total) in rows:
             if not total_count:
-                total_count = row[14]  # total_count from window function
+                total_count = row_total  # total_count from window function
                 
             # Format date properly - convert from ISO format to YYYY-MM-DD
-            date_str = row[1]
             if 'T' in date_str:
                 date_str = date_str.split('T')[0]  # Remove time component if present
             
             transactions.append({
-                "id": row[0],
+                "id": trans_id,
                 "date": date_str,
-                "account": row[2],
-                "account_name": row[3],
-                "description": row[4],
-                "withdrawal": float(row[5]) if row[5] else 0.0,
-                "deposit": float(row[6]) if row[6] else 0.0,
-                "category_id": row[7],
-                "category_name": row[8],
-                "tax_type": row[9] if row[9] else "NONE",
-                "is_tax_deductible": bool(row[10]),
-                "is_hidden": bool(row[11]),
-                "is_matched": bool(row[12]),
-                "is_internal_transfer": bool(row[13])
+                "account": account,
+                "account_name": account_name,
+                "description": description,
+                "withdrawal": float(withdrawal) if withdrawal else 0.0,
+                "deposit": float(deposit) if deposit else 0.0,
+                "category_id": category_id,
+                "category_name": category_name,
+                "tax_type": tax_type if tax_type else "NONE",
+                "is_tax_deductible": bool(is_tax_deductible),
+                "is_hidden": bool(is_hidden),
+                "is_matched": bool(is_matched),
+                "is_internal_transfer": bool(is_internal_transfer)
             })
         
         # Calculate total pages
@@ -369,30 +376,34 @@ async def get_all_transactions():
         
         # Convert to response format
         transactions = []
-        for row in rows:
+        for (trans_id, date_str, account, account_name, description, withdrawal, deposit,
+             category_id, category_name, tax_type, is_tax_deductible, is_hidden,
+             is_matched, is_internal_transfer) in rows:
             # Format date properly - convert from ISO format to YYYY-MM-DD
-            date_str = row[1]
             if 'T' in date_str:
                 date_str = date_str.split('T')[0]  # Remove time component if present
             
             transactions.append({
-                "id": row[0],
+                "id": trans_id,
                 "date": date_str,
-                "account": row[2],
-                "account_name": row[3],
-                "description": row[4],
-                "withdrawal": float(row[5]) if row[5] else 0.0,
-                "deposit": float(row[6]) if row[6] else 0.0,
-                "category_id": row[7],
-                "category_name": row[8],
-                "tax_type": row[9] if row[9] else "NONE",
-                "is_tax_deductible": bool(row[10]),
-                "is_hidden": bool(row[11]),
-                "is_matched": bool(row[12]),
-                "is_internal_transfer": bool(row[13])
+                "account": account,
+                "account_name": account_name,
+                "description": description,
+                "withdrawal": float(withdrawal) if withdrawal else 0.0,
+                "deposit": float(deposit) if deposit else 0.0,
+                "category_id": category_id,
+                "category_name": category_name,
+                "tax_type": tax_type if tax_type else "NONE",
+                "is_tax_deductible": bool(is_tax_deductible),
+                "is_hidden": bool(is_hidden),
+                "is_matched": bool(is_matched),
+                "is_internal_transfer": bool(is_internal_transfer)
             })
         
-        return transactions
+        # The rows are already plain JSON types, so they are serialised once
+        # directly rather than validated against TransactionResponse and
+        # re-encoded item by item (response_model still documents the shape)
+        return JSONResponse(content=transactions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -678,7 +689,7 @@ async def preview_import_file(file: UploadFile = File(...)):
                 for trans in transactions:
                     transactions_data.append({
                         "date": trans.date.strftime('%Y-%m-%d'),
-                        "description": trans.payee + (f" - {trans.memo}" if trans.memo else ''),
+                        "description": trans.description,
                         "amount": float(trans.amount),
                         "withdrawal": float(abs(trans.amount)) if trans.amount < 0 else 0.0,
                         "deposit": float(trans.amount) if trans.amount > 0 else 0.0,
@@ -795,18 +806,20 @@ async def get_auto_categorisation_rules():
         """)
         rules = cursor.fetchall()
         
+        # Get the descriptions for all rules at once (if table exists)
+        descriptions_by_rule = defaultdict(list)
+        if 'auto_categorisation_rule_descriptions' in existing_tables:
+            cursor.execute("""
+                SELECT rule_id, operator, description_text, case_sensitive, sequence, match_type
+                FROM auto_categorisation_rule_descriptions
+                ORDER BY rule_id, sequence
+            """)
+            for rule_id, *description in cursor.fetchall():
+                descriptions_by_rule[rule_id].append(description)
+        
         result = []
         for rule in rules:
-            # Get descriptions for this rule (if table exists)
-            descriptions = []
-            if 'auto_categorisation_rule_descriptions' in existing_tables:
-                cursor.execute("""
-                    SELECT operator, description_text, case_sensitive, sequence
-                    FROM auto_categorisation_rule_descriptions
-                    WHERE rule_id = ?
-                    ORDER BY sequence
-                """, (rule[0],))  # rule[0] is the id
-                descriptions = cursor.fetchall()
+            descriptions = descriptions_by_rule.get(rule[0], [])  # rule[0] is the id
             
             result.append({
                 "id": rule[0],
@@ -824,7 +837,8 @@ async def get_auto_categorisation_rules():
                         "operator": str(desc[0]) if desc[0] else None,
                         "description_text": str(desc[1]) if desc[1] else "",
                         "case_sensitive": bool(desc[2]) if desc[2] is not None else False,
-                        "sequence": int(desc[3]) if desc[3] is not None else 0
+                        "sequence": int(desc[3]) if desc[3] is not None else 0,
+                        "match_type": str(desc[4]) if desc[4] else "contains"
                     }
                     for desc in descriptions
                 ]
@@ -860,18 +874,21 @@ async def create_auto_categorisation_rule(request: CreateRuleRequest):
         rule_id = cursor.lastrowid
         
         # Insert description conditions
-        for i, desc in enumerate(request.descriptions):
-            cursor.execute("""
-                INSERT INTO auto_categorisation_rule_descriptions
-                (rule_id, operator, description_text, case_sensitive, sequence)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
+        cursor.executemany("""
+            INSERT INTO auto_categorisation_rule_descriptions
+            (rule_id, operator, description_text, case_sensitive, match_type, sequence)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 rule_id,
                 desc.get("operator"),
                 desc["description_text"],
                 desc.get("case_sensitive", False),
+                desc.get("match_type") or "contains",
                 i
-            ))
+            )
+            for i, desc in enumerate(request.descriptions)
+        ])
         
         db_manager.commit()
         return {"id": rule_id, "message": "Rule created successfully"}
@@ -897,18 +914,21 @@ async def update_auto_categorisation_rule(rule_id: int, request: CreateRuleReque
         cursor.execute("DELETE FROM auto_categorisation_rule_descriptions WHERE rule_id = ?", (rule_id,))
         
         # Insert new descriptions
-        for i, desc in enumerate(request.descriptions):
-            cursor.execute("""
-                INSERT INTO auto_categorisation_rule_descriptions
-                (rule_id, operator, description_text, case_sensitive, sequence)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
+        cursor.executemany("""
+            INSERT INTO auto_categorisation_rule_descriptions
+            (rule_id, operator, description_text, case_sensitive, match_type, sequence)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 rule_id,
                 desc.get("operator"),
                 desc["description_text"],
                 desc.get("case_sensitive", False),
+                desc.get("match_type") or "contains",
                 i
-            ))
+            )
+            for i, desc in enumerate(request.descriptions)
+        ])
         
         db_manager.commit()
         return {"message": "Rule updated successfully"}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { Plus, Edit, Trash2, CreditCard, Building, DollarSign } from 'lucide-react';
 import axios from 'axios';
 
@@ -13,11 +13,52 @@ interface BankAccount {
   notes: string;
 }
 
+// Formatters are created once; constructing an Intl formatter is far more
+// expensive than using one
+const currencyFormatter = new Intl.NumberFormat('en-AU', {
+  style: 'currency',
+  currency: 'AUD'
+});
+const dateFormatter = new Intl.DateTimeFormat('en-AU');
+
+// Six digit BSB, optionally written with a dash after the third digit
+const BSB_PATTERN = /^\d{3}-?\d{3}$/;
+// Characters dropped as they are typed into the BSB and account number fields
+const NON_BSB_CHARACTERS = /[^\d-]/g;
+const NON_DIGITS = /\D/g;
+
+const formatCurrency = (value: number) => {
+  return currencyFormatter.format(value);
+};
+
+const formatDate = (dateString?: string) => {
+  if (!dateString) return 'Never';
+  return dateFormatter.format(new Date(dateString));
+};
+
+const getBankLogo = (bankName: string) => {
+  if (bankName.toLowerCase().includes('westpac')) {
+    return <div className="w-8 h-8 bg-red-500 rounded flex items-center justify-center text-white text-xs font-bold">W</div>;
+  }
+  if (bankName.toLowerCase().includes('nab')) {
+    return <div className="w-8 h-8 bg-red-600 rounded flex items-center justify-center text-white text-xs font-bold">N</div>;
+  }
+  if (bankName.toLowerCase().includes('anz')) {
+    return <div className="w-8 h-8 bg-blue-600 rounded flex items-center justify-center text-white text-xs font-bold">A</div>;
+  }
+  if (bankName.toLowerCase().includes('cba') || bankName.toLowerCase().includes('commonwealth')) {
+    return <div className="w-8 h-8 bg-yellow-500 rounded flex items-center justify-center text-white text-xs font-bold">C</div>;
+  }
+  return <div className="w-8 h-8 bg-gray-500 rounded flex items-center justify-center text-white text-xs font-bold"><Building size={16} /></div>;
+};
+
 const AccountView: React.FC = () => {
   const [accounts, setAccounts] = useState<BankAccount[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [showAddDialog, setShowAddDialog] = useState(false);
+  // Validation or save error shown inside the add account dialog
+  const [addError, setAddError] = useState<string | null>(null);
   const [newAccount, setNewAccount] = useState({
     name: '',
     account_number: '',
@@ -80,19 +121,31 @@ const AccountView: React.FC = () => {
   };
 
   const handleAddAccount = async () => {
-    if (!newAccount.name.trim() || !newAccount.account_number.trim() || !newAccount.bsb.trim() || !newAccount.bank_name.trim()) {
-      alert('Please fill in all required fields');
+    // Trimmed once, then used for both validation and the request
+    const name = newAccount.name.trim();
+    const accountNumber = newAccount.account_number.trim();
+    const bsb = newAccount.bsb.trim();
+    const bankName = newAccount.bank_name.trim();
+    const notes = newAccount.notes.trim();
+
+    if (!name || !accountNumber || !bsb || !bankName) {
+      setAddError('Please fill in all required fields');
+      return;
+    }
+
+    if (!BSB_PATTERN.test(bsb)) {
+      setAddError('BSB must be 6 digits, e.g. 123-456');
       return;
     }
 
     try {
       await axios.post('http://localhost:8000/api/accounts', null, {
         params: {
-          name: newAccount.name,
-          account_number: newAccount.account_number,
-          bsb: newAccount.bsb,
-          bank_name: newAccount.bank_name,
-          notes: newAccount.notes
+          name,
+          account_number: accountNumber,
+          bsb,
+          bank_name: bankName,
+          notes
         }
       });
 
@@ -107,44 +160,89 @@ const AccountView: React.FC = () => {
         bank_name: '',
         notes: ''
       });
+      setAddError(null);
       setShowAddDialog(false);
     } catch (err) {
       console.error('Error creating account:', err);
-      alert('Failed to create account');
+      setAddError('Failed to create account');
     }
   };
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('en-AU', {
-      style: 'currency',
-      currency: 'AUD'
-    }).format(value);
-  };
+  // Summary figures and account cards only depend on the loaded accounts,
+  // so typing in the add account dialog doesn't rebuild every card
+  const totalBalance = useMemo(
+    () => accounts.reduce((sum, account) => sum + account.current_balance, 0),
+    [accounts]
+  );
+  const activeBankCount = useMemo(
+    () => new Set(accounts.map(a => a.bank_name)).size,
+    [accounts]
+  );
 
-  const formatDate = (dateString?: string) => {
-    if (!dateString) return 'Never';
-    return new Date(dateString).toLocaleDateString('en-AU');
-  };
+  const accountCards = useMemo(() => accounts.map((account) => (
+    <div key={account.id} className="bg-white dark:bg-gray-800 rounded-lg shadow-sm border border-gray-200 dark:border-gray-700 hover:shadow-md transition-shadow">
+      <div className="p-6">
+        {/* Account Header */}
+        <div className="flex items-start justify-between mb-4">
+          <div className="flex items-center space-x-3">
+            {getBankLogo(account.bank_name)}
+            <div>
+              <h3 className="text-lg font-semibold text-gray-900 dark:text-gray-100">{account.name}</h3>
+              <p className="text-sm text-gray-500 dark:text-gray-400">{account.bank_name}</p>
+            </div>
+          </div>
+          <button className="text-gray-400 dark:text-gray-500 hover:text-gray-600 dark:hover:text-gray-300">
+            <Edit size={16} />
+          </button>
+        </div>
 
-  const getTotalBalance = () => {
-    return accounts.reduce((sum, account) => sum + account.current_balance, 0);
-  };
+        {/* Account Details */}
+        <div className="space-y-3">
+          <div>
+            <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Account Number</p>
+            <p className="text-sm font-mono text-gray-900 dark:text-gray-100">{account.account_number}</p>
+          </div>
 
-  const getBankLogo = (bankName: string) => {
-    if (bankName.toLowerCase().includes('westpac')) {
-      return <div className="w-8 h-8 bg-red-500 rounded flex items-center justify-center text-white text-xs font-bold">W</div>;
-    }
-    if (bankName.toLowerCase().includes('nab')) {
-      return <div className="w-8 h-8 bg-red-600 rounded flex items-center justify-center text-white text-xs font-bold">N</div>;
-    }
-    if (bankName.toLowerCase().includes('anz')) {
-      return <div className="w-8 h-8 bg-blue-600 rounded flex items-center justify-center text-white text-xs font-bold">A</div>;
-    }
-    if (bankName.toLowerCase().includes('cba') || bankName.toLowerCase().includes('commonwealth')) {
-      return <div className="w-8 h-8 bg-yellow-500 rounded flex items-center justify-center text-white text-xs font-bold">C</div>;
-    }
-    return <div className="w-8 h-8 bg-gray-500 rounded flex items-center justify-center text-white text-xs font-bold"><Building size={16} /></div>;
-  };
+          <div>
+            <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">BSB</p>
+            <p className="text-sm font-mono text-gray-900 dark:text-gray-100">{account.bsb}</p>
+          </div>
+
+          <div>
+            <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Current Balance</p>
+            <p className={`text-lg font-semibold ${account.current_balance >= 0 ? 'text-green-600' : 'text-red-600'}`}>
+              {formatCurrency(account.current_balance)}
+            </p>
+          </div>
+
+          <div>
+            <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Last Import</p>
+            <p className="text-sm text-gray-900 dark:text-gray-100">{formatDate(account.last_import_date)}</p>
+          </div>
+
+          {account.notes && (
+            <div>
+              <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Notes</p>
+              <p className="text-sm text-gray-900 dark:text-gray-100">{account.notes}</p>
+            </div>
+          )}
+        </div>
+
+        {/* Action Buttons */}
+        <div className="flex space-x-2 mt-4 pt-4 border-t border-gray-100 dark:border-gray-700">
+          <button className="flex-1 bg-indigo-50 text-indigo-600 py-2 px-3 rounded text-sm font-medium hover:bg-indigo-100">
+            View Transactions
+          </button>
+          <button className="bg-gray-50 dark:bg-gray-700 text-gray-600 dark:text-gray-300 py-2 px-3 rounded text-sm hover:bg-gray-100 dark:hover:bg-gray-600">
+            <Edit size={16} />
+          </button>
+          <button className="bg-red-50 text-red-600 py-2 px-3 rounded text-sm hover:bg-red-100">
+            <Trash2 size={16} />
+          </button>
+        </div>
+      </div>
+    </div>
+  )), [accounts]);
 
   if (loading) {
     return (
@@ -198,7 +296,7 @@ const AccountView: React.FC = () => {
               </div>
               <div className="ml-3">
                 <p className="text-sm font-medium text-green-600 dark:text-green-300">Total Balance</p>
-                <p className="text-2xl font-semibold text-green-900 dark:text-green-100">{formatCurrency(getTotalBalance())}</p>
+                <p className="text-2xl font-semibold text-green-900 dark:text-green-100">{formatCurrency(totalBalance)}</p>
               </div>
             </div>
           </div>
@@ -210,9 +308,7 @@ const AccountView: React.FC = () => {
               </div>
               <div className="ml-3">
                 <p className="text-sm font-medium text-gray-600 dark:text-gray-400">Active Banks</p>
-                <p className="text-2xl font-semibold text-gray-900 dark:text-gray-100">
-                  {new Set(accounts.map(a => a.bank_name)).size}
-                </p>
+                <p className="text-2xl font-semibold text-gray-900 dark:text-gray-100">{activeBankCount}</p>
               </div>
             </div>
           </div>
@@ -222,70 +318,7 @@ const AccountView: React.FC = () => {
       {/* Account Cards */}
       <div className="flex-1 overflow-auto p-4">
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-          {accounts.map((account) => (
-            <div key={account.id} className="bg-white dark:bg-gray-800 rounded-lg shadow-sm border border-gray-200 dark:border-gray-700 hover:shadow-md transition-shadow">
-              <div className="p-6">
-                {/* Account Header */}
-                <div className="flex items-start justify-between mb-4">
-                  <div className="flex items-center space-x-3">
-                    {getBankLogo(account.bank_name)}
-                    <div>
-                      <h3 className="text-lg font-semibold text-gray-900 dark:text-gray-100">{account.name}</h3>
-                      <p className="text-sm text-gray-500 dark:text-gray-400">{account.bank_name}</p>
-                    </div>
-                  </div>
-                  <button className="text-gray-400 dark:text-gray-500 hover:text-gray-600 dark:hover:text-gray-300">
-                    <Edit size={16} />
-                  </button>
-                </div>
-
-                {/* Account Details */}
-                <div className="space-y-3">
-                  <div>
-                    <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Account Number</p>
-                    <p className="text-sm font-mono text-gray-900 dark:text-gray-100">{account.account_number}</p>
-                  </div>
-
-                  <div>
-                    <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">BSB</p>
-                    <p className="text-sm font-mono text-gray-900 dark:text-gray-100">{account.bsb}</p>
-                  </div>
-
-                  <div>
-                    <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Current Balance</p>
-                    <p className={`text-lg font-semibold ${account.current_balance >= 0 ? 'text-green-600' : 'text-red-600'}`}>
-                      {formatCurrency(account.current_balance)}
-                    </p>
-                  </div>
-
-                  <div>
-                    <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Last Import</p>
-                    <p className="text-sm text-gray-900 dark:text-gray-100">{formatDate(account.last_import_date)}</p>
-                  </div>
-
-                  {account.notes && (
-                    <div>
-                      <p className="text-xs text-gray-500 dark:text-gray-400 uppercase tracking-wider">Notes</p>
-                      <p className="text-sm text-gray-900 dark:text-gray-100">{account.notes}</p>
-                    </div>
-                  )}
-                </div>
-
-                {/* Action Buttons */}
-                <div className="flex space-x-2 mt-4 pt-4 border-t border-gray-100 dark:border-gray-700">
-                  <button className="flex-1 bg-indigo-50 text-indigo-600 py-2 px-3 rounded text-sm font-medium hover:bg-indigo-100">
-                    View Transactions
-                  </button>
-                  <button className="bg-gray-50 dark:bg-gray-700 text-gray-600 dark:text-gray-300 py-2 px-3 rounded text-sm hover:bg-gray-100 dark:hover:bg-gray-600">
-                    <Edit size={16} />
-                  </button>
-                  <button className="bg-red-50 text-red-600 py-2 px-3 rounded text-sm hover:bg-red-100">
-                    <Trash2 size={16} />
-                  </button>
-                </div>
-              </div>
-            </div>
-          ))}
+          {accountCards}
         </div>
       </div>
 
@@ -330,8 +363,10 @@ const AccountView: React.FC = () => {
                   <input
                     type="text"
                     className="w-full border border-gray-300 dark:border-gray-600 rounded-md px-3 py-2 focus:outline-none focus:ring-1 focus:ring-indigo-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100"
+                    inputMode="numeric"
+                    maxLength={7}
                     value={newAccount.bsb}
-                    onChange={(e) => setNewAccount({...newAccount, bsb: e.target.value})}
+                    onChange={(e) => setNewAccount({...newAccount, bsb: e.target.value.replace(NON_BSB_CHARACTERS, '')})}
                     placeholder="123-456"
                   />
                 </div>
@@ -343,8 +378,9 @@ const AccountView: React.FC = () => {
                   <input
                     type="text"
                     className="w-full border border-gray-300 dark:border-gray-600 rounded-md px-3 py-2 focus:outline-none focus:ring-1 focus:ring-indigo-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100"
+                    inputMode="numeric"
                     value={newAccount.account_number}
-                    onChange={(e) => setNewAccount({...newAccount, account_number: e.target.value})}
+                    onChange={(e) => setNewAccount({...newAccount, account_number: e.target.value.replace(NON_DIGITS, '')})}
                     placeholder="123456789"
                   />
                 </div>
@@ -364,10 +400,17 @@ const AccountView: React.FC = () => {
               </div>
             </div>
 
+            {addError && (
+              <p className="mt-4 text-sm text-red-600 dark:text-red-400">{addError}</p>
+            )}
+
             <div className="flex justify-end space-x-3 mt-6">
               <button
                 className="px-4 py-2 text-gray-600 dark:text-gray-400 hover:text-gray-800 dark:hover:text-gray-200"
-                onClick={() => setShowAddDialog(false)}
+                onClick={() => {
+                  setAddError(null);
+                  setShowAddDialog(false);
+                }}
               >
                 Cancel
               </button>
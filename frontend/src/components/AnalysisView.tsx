@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo, useRef } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, PieChart, Pie, Cell, ResponsiveContainer, LineChart, Line, Brush, ReferenceLine } from 'recharts';
 import { DollarSign, TrendingUp, TrendingDown, Filter, BarChart3, LineChart as LineChartIcon, Target, ChevronDown, ChevronRight, Eye, EyeOff, Save, Trash2 } from 'lucide-react';
 import axios from 'axios';
@@ -24,12 +24,6 @@ interface ChartDataPoint {
   cumulativeExpenses?: number;
   /** Cumulative net income from start of analysis period to this point */
   cumulativeNet?: number;
-  /** Average income across all periods (used for reference lines) */
-  avgIncome?: number;
-  /** Average expenses across all periods (used for reference lines) */
-  avgExpenses?: number;
-  /** Average net income across all periods (used for reference lines) */
-  avgNet?: number;
   /** Dynamic category data for stacked charts - category names as keys, amounts as values */
   [key: string]: any;
 }
@@ -82,6 +76,265 @@ interface AnalysisView {
   showAverages: boolean;
 }
 
+/**
+ * Chart and breakdown data produced by processing transactions for one
+ * combination of date range, aggregation and category filter.
+ */
+interface AnalysisResult {
+  /** Expense categories for the pie chart, with small categories grouped into "Other" */
+  categoryData: any[];
+  /** Income totals by category */
+  incomeCategoryData: any[];
+  /** Expense totals by category, without "Other" grouping */
+  expenseCategoriesData: any[];
+  /** Time-series data points for the income vs expenses chart */
+  monthlyData: ChartDataPoint[];
+}
+
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+
+/** Number of processed filter combinations kept for reuse */
+const ANALYSIS_CACHE_SIZE = 20;
+
+/**
+ * Number of chart points from which animation and line dots are turned off,
+ * as Recharts slows down sharply when animating or marking long series
+ * (such as daily data over a year or more)
+ */
+const LARGE_SERIES_POINTS = 100;
+
+/** Delay after the last filter change before chart data is reprocessed */
+const ANALYSIS_DEBOUNCE_MS = 150;
+
+const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8', '#82CA9D', '#8DD1E1', '#D084D0'];
+
+const getCategoryColor = (categoryName: string, index: number) => {
+  return categoryName === 'Other' ? '#000000' : COLORS[index % COLORS.length];
+};
+
+// Formatters are created once; constructing an Intl formatter is far more
+// expensive than using one, and these run for every value and axis tick
+const currencyFormatter = new Intl.NumberFormat('en-AU', {
+  style: 'currency',
+  currency: 'AUD'
+});
+const dayLabelFormatter = new Intl.DateTimeFormat('en-AU', { month: 'short', day: 'numeric' });
+const monthLabelFormatter = new Intl.DateTimeFormat('en-AU', { month: 'short', year: 'numeric' });
+
+const formatCurrency = (value: number) => {
+  return currencyFormatter.format(value);
+};
+
+const formatPeriodLabel = (period: string, aggregation: AnalysisView['aggregation'], date?: Date) => {
+  if (!date) return period;
+  
+  switch (aggregation) {
+    case 'day':
+      return dayLabelFormatter.format(date);
+    case 'week':
+      return `Week ${dayLabelFormatter.format(date)}`;
+    case 'month':
+      return monthLabelFormatter.format(date);
+    case 'quarter':
+      return period;
+    default:
+      return period;
+  }
+};
+
+/**
+ * Props for the income vs expenses chart.
+ */
+interface IncomeExpenseChartProps {
+  /** Time-series data points to plot */
+  data: ChartDataPoint[];
+  /** Time aggregation level, used for axis and tooltip labels */
+  aggregation: AnalysisView['aggregation'];
+  /** Chart visualization type */
+  chartType: AnalysisView['chartType'];
+  /** Whether to plot income */
+  showIncome: boolean;
+  /** Whether to plot expenses */
+  showExpenses: boolean;
+  /** Whether line charts plot cumulative totals */
+  showCumulative: boolean;
+  /** Whether bar charts show average reference lines */
+  showAverages: boolean;
+  /** Average income and expenses per period, for the reference lines */
+  averages: { income: number; expenses: number };
+  /** Expense categories drawn as separate bars in the stacked chart */
+  stackedCategoryNames: string[];
+}
+
+/**
+ * Income vs expenses chart.
+ *
+ * Memoised so that state changes elsewhere in AnalysisView, such as typing a
+ * view name or opening a panel, do not make Recharts recompute its scales
+ * and redraw the chart when none of these props have changed.
+ */
+const IncomeExpenseChart = React.memo(({
+  data,
+  aggregation,
+  chartType,
+  showIncome,
+  showExpenses,
+  showCumulative,
+  showAverages,
+  averages,
+  stackedCategoryNames
+}: IncomeExpenseChartProps) => {
+  // Date of each charted period, for labelling axis ticks without searching
+  // the data points for every tick
+  const periodDates = useMemo(
+    () => new Map(data.map(item => [item.period, item.date])),
+    [data]
+  );
+
+  const isLargeSeries = data.length >= LARGE_SERIES_POINTS;
+
+  return (
+    <ResponsiveContainer width="100%" height={350}>
+      {chartType === 'line' ? (
+        <LineChart data={data}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis 
+            dataKey="period" 
+            tickFormatter={(value) => formatPeriodLabel(value, aggregation, periodDates.get(value))}
+          />
+          <YAxis tickFormatter={(value) => `$${(value / 1000).toFixed(1)}k`} />
+          <Tooltip 
+            formatter={(value) => formatCurrency(Number(value))} 
+            labelFormatter={(label, payload) => {
+              if (payload && payload[0]) {
+                return formatPeriodLabel(label, aggregation, payload[0].payload.date);
+              }
+              return label;
+            }}
+          />
+          <Legend />
+          {showIncome && (
+            <Line 
+              type="monotone" 
+              dataKey={showCumulative ? "cumulativeIncome" : "income"} 
+              stroke="#22C55E" 
+              strokeWidth={2}
+              name={showCumulative ? "Cumulative Income" : "Income"}
+              isAnimationActive={!isLargeSeries}
+              dot={!isLargeSeries}
+            />
+          )}
+          {showExpenses && (
+            <Line 
+              type="monotone" 
+              dataKey={showCumulative ? "cumulativeExpenses" : "expenses"} 
+              stroke="#EF4444" 
+              strokeWidth={2}
+              name={showCumulative ? "Cumulative Expenses" : "Expenses"}
+              isAnimationActive={!isLargeSeries}
+              dot={!isLargeSeries}
+            />
+          )}
+          <Line 
+            type="monotone" 
+            dataKey={showCumulative ? "cumulativeNet" : "net"} 
+            stroke="#3B82F6" 
+            strokeWidth={2}
+            name={showCumulative ? "Cumulative Net" : "Net"}
+            isAnimationActive={!isLargeSeries}
+            dot={!isLargeSeries}
+          />
+          {/* No averages for line charts */}
+          <Brush dataKey="period" height={30} />
+        </LineChart>
+      ) : (
+        <BarChart data={data}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis 
+            dataKey="period" 
+            tickFormatter={(value) => formatPeriodLabel(value, aggregation, periodDates.get(value))}
+          />
+          <YAxis tickFormatter={(value) => `$${(value / 1000).toFixed(1)}k`} />
+          <Tooltip 
+            formatter={(value) => formatCurrency(Number(value))} 
+            labelFormatter={(label, payload) => {
+              if (payload && payload[0]) {
+                return formatPeriodLabel(label, aggregation, payload[0].payload.date);
+              }
+              return label;
+            }}
+          />
+          <Legend />
+          {showIncome && (
+            <Bar 
+              dataKey="income" 
+              fill="#22C55E" 
+              name="Income"
+              stackId={chartType === 'stacked' ? 'stack' : undefined}
+              isAnimationActive={!isLargeSeries}
+            />
+          )}
+          {showExpenses && chartType === 'stacked' && stackedCategoryNames.length > 0 ? (
+            // Show individual categories in stacked view
+            stackedCategoryNames.map((categoryName, index) => (
+              <Bar 
+                key={categoryName}
+                dataKey={categoryName}
+                fill={COLORS[index % COLORS.length]} 
+                name={categoryName}
+                stackId="expenses"
+                isAnimationActive={!isLargeSeries}
+              />
+            ))
+          ) : showExpenses ? (
+            <Bar 
+              dataKey="expenses" 
+              fill="#EF4444" 
+              name="Expenses"
+              stackId={chartType === 'stacked' ? 'stack' : undefined}
+              isAnimationActive={!isLargeSeries}
+            />
+          ) : null}
+          {/* Average lines - only for bar charts */}
+          {showAverages && showIncome && (chartType === 'grouped' || chartType === 'stacked') && data.length > 0 && (
+            <ReferenceLine y={averages.income} stroke="#22C55E" strokeDasharray="5 5" label="Avg Income" />
+          )}
+          {showAverages && showExpenses && (chartType === 'grouped' || chartType === 'stacked') && data.length > 0 && (
+            <ReferenceLine y={averages.expenses} stroke="#EF4444" strokeDasharray="5 5" label="Avg Expenses" />
+          )}
+          <Brush dataKey="period" height={30} />
+        </BarChart>
+      )}
+    </ResponsiveContainer>
+  );
+});
+
+/**
+ * Pie chart of expenses by category, memoised for the same reason as
+ * IncomeExpenseChart.
+ */
+const ExpenseBreakdownChart = React.memo(({ data }: { data: any[] }) => (
+  <ResponsiveContainer width="100%" height={350}>
+    <PieChart>
+      <Pie
+        data={data}
+        cx="50%"
+        cy="50%"
+        labelLine={false}
+        label={({ name, percentage }) => `${name} (${percentage.toFixed(1)}%)`}
+        outerRadius={120}
+        fill="#8884d8"
+        dataKey="amount"
+      >
+        {data.map((category, index) => (
+          <Cell key={`cell-${index}`} fill={getCategoryColor(category.name, index)} />
+        ))}
+      </Pie>
+      <Tooltip formatter={(value) => formatCurrency(Number(value))} />
+    </PieChart>
+  </ResponsiveContainer>
+));
+
 /**
  * AnalysisView Component
  * 
@@ -105,7 +358,7 @@ interface AnalysisView {
  * Performance Considerations:
  * - Fetches all transaction data once on mount for complete analysis capability
  * - Client-side processing enables instant filter responses
- * - Uses React.memo and useCallback for expensive operations (TODO: implement)
+ * - Charts are React.memo components, so they only re-render when their data or display options change
  * - Chart data is recalculated on filter changes for real-time analysis
  */
 const AnalysisView: React.FC = () => {
@@ -139,6 +392,101 @@ const AnalysisView: React.FC = () => {
   const [showCumulative, setShowCumulative] = useState(false);
   const [showAverages, setShowAverages] = useState(false);
 
+  // Totals and per-period averages over the charted periods, worked out once
+  // per data change instead of on every use in the cards, chart and table
+  const periodTotals = useMemo(() => {
+    let income = 0;
+    let expenses = 0;
+    let net = 0;
+    monthlyData.forEach(item => {
+      income += item.income;
+      expenses += item.expenses;
+      net += item.net;
+    });
+
+    const periodCount = monthlyData.length || 1;
+    return {
+      income,
+      net,
+      averages: { income: income / periodCount, expenses: expenses / periodCount }
+    };
+  }, [monthlyData]);
+
+  const totalExpenses = useMemo(
+    () => categoryData.reduce((sum, category) => sum + category.amount, 0),
+    [categoryData]
+  );
+
+  // Net breakdown rows for the categories table. Rebuilt only when the
+  // category totals change, not on every render of the view.
+  const { combinedData, maxAbsValue } = useMemo(() => {
+    // Combine income and expense data
+    const incomeMap = new Map(incomeCategoryData.map(cat => [cat.name, cat.amount]));
+    const expenseMap = new Map(expenseCategoriesData.map(cat => [cat.name, cat.amount]));
+    
+    // Get all unique category names
+    const allCategoryNames = new Set([
+      ...incomeCategoryData.map(cat => cat.name),
+      ...expenseCategoriesData.map(cat => cat.name)
+    ]);
+    
+    // Create combined data with net calculations
+    const rows = Array.from(allCategoryNames).map(name => {
+      const income = incomeMap.get(name) || 0;
+      const expense = expenseMap.get(name) || 0;
+      const net = income - expense;
+      
+      return {
+        name,
+        income,
+        expense,
+        net,
+        totalAmount: Math.abs(net)
+      };
+    }).sort((a, b) => b.net - a.net); // Sort by net (highest income to lowest expense)
+    
+    // Calculate max absolute value for bar width scaling
+    const maxValue = Math.max(...rows.map(cat => 
+      Math.max(cat.income, cat.expense, Math.abs(cat.net))
+    ));
+
+    return { combinedData: rows, maxAbsValue: maxValue };
+  }, [incomeCategoryData, expenseCategoriesData]);
+
+  // Processed results by filter combination for the current transactions,
+  // so returning to an earlier combination skips reprocessing
+  const analysisCache = useRef<{ transactions: any[]; results: Map<string, AnalysisResult> }>({
+    transactions: [],
+    results: new Map()
+  });
+
+  // Selected categories expanded to include all of their descendants, so
+  // matching a transaction against the filter is a single set lookup
+  // (selecting a parent category includes its children)
+  const selectedCategoryIds = useMemo(() => {
+    const childIds = new Map<string, string[]>();
+    categories.forEach(category => {
+      if (category.parent_id) {
+        const siblings = childIds.get(category.parent_id);
+        if (siblings) {
+          siblings.push(category.id);
+        } else {
+          childIds.set(category.parent_id, [category.id]);
+        }
+      }
+    });
+
+    const ids = new Set<string>();
+    const stack = [...selectedCategories];
+    while (stack.length > 0) {
+      const categoryId = stack.pop()!;
+      if (ids.has(categoryId)) continue;
+      ids.add(categoryId);
+      childIds.get(categoryId)?.forEach(childId => stack.push(childId));
+    }
+    return ids;
+  }, [categories, selectedCategories]);
+
   useEffect(() => {
     fetchAnalysisData();
   }, []);
@@ -154,11 +502,19 @@ const AnalysisView: React.FC = () => {
   // ARCHITECTURE DECISION: Real-time client-side processing for responsive UX
   // Recalculates chart data whenever filters change to provide instant feedback
   // Trade-off: Higher client-side computation vs. better user experience
+  //
+  // Filter changes tend to arrive in bursts, such as typing a custom date or
+  // clicking through categories, so processing waits for them to settle.
+  // Newly loaded transactions are processed straight away.
   useEffect(() => {
-    if (transactions.length > 0) {
-      processTransactionData(transactions);
-    }
-  }, [transactions, selectedPeriod, customDateRange, aggregation, selectedCategories, chartType, showCumulative, showAverages]);
+    if (transactions.length === 0) return;
+
+    const delay = analysisCache.current.transactions === transactions ? ANALYSIS_DEBOUNCE_MS : 0;
+    const timeoutId = setTimeout(() => processTransactionData(transactions), delay);
+    return () => clearTimeout(timeoutId);
+  // Chart type and the cumulative/average toggles only change how the data is
+  // drawn, so they do not trigger reprocessing
+  }, [transactions, selectedPeriod, customDateRange, aggregation, selectedCategoryIds]);
 
   const fetchAnalysisData = async () => {
     try {
@@ -170,11 +526,9 @@ const AnalysisView: React.FC = () => {
 
       const transactionsData = transactionsRes.data;
       
+      // Chart data is processed by the effect that watches transactions
       setTransactions(transactionsData);
       
-      // Process data for charts
-      processTransactionData(transactionsData);
-      
       setError(null);
     } catch (err) {
       setError('Failed to fetch analysis data');
@@ -266,6 +620,9 @@ const AnalysisView: React.FC = () => {
         case 'week':
           startDate = new Date(now);
           startDate.setDate(now.getDate() - 7);
+          // Start at midnight like the other presets, so the range (and the
+          // analysis cache key) stays the same throughout the day
+          startDate.setHours(0, 0, 0, 0);
           break;
         case 'month':
           startDate = new Date(now.getFullYear(), now.getMonth(), 1);
@@ -303,40 +660,67 @@ const AnalysisView: React.FC = () => {
    */
   const processTransactionData = (transactions: any[]) => {
     const { startDate, endDate } = getDateRange();
+
+    // The result depends only on the transactions and these inputs. The end of
+    // the range is "now" for preset periods, so it is keyed by day.
+    const cacheKey = JSON.stringify([
+      startDate.getTime(),
+      endDate.toDateString(),
+      aggregation,
+      Array.from(selectedCategoryIds).sort()
+    ]);
+    if (analysisCache.current.transactions !== transactions) {
+      analysisCache.current = { transactions, results: new Map() };
+    }
+    const cachedResult = analysisCache.current.results.get(cacheKey);
+    if (cachedResult) {
+      applyAnalysisResult(cachedResult);
+      return;
+    }
     
-    // Phase 1: Apply basic filters to exclude irrelevant transactions
-    // Exclude internal transfers (money moving between own accounts)
-    // Exclude uncategorised transactions (no meaningful analysis possible)
-    // Apply date range filtering based on selected period
-    const filteredTransactions = transactions.filter(transaction => {
-      if (transaction.is_internal_transfer) return false;
-      if (!transaction.category_id) return false; // Exclude uncategorised transactions
+    // Phases 1 and 2 run as a single pass that fills two parallel arrays:
+    // the transactions kept for analysis and their parsed dates. Each date is
+    // parsed once here and reused when aggregating.
+    const filterByCategory = selectedCategories.length > 0;
+    const analysedTransactions: any[] = [];
+    const analysedDates: Date[] = [];
+    transactions.forEach(transaction => {
+      // Phase 1: Apply basic filters to exclude irrelevant transactions
+      // Exclude internal transfers (money moving between own accounts)
+      // Exclude uncategorised transactions (no meaningful analysis possible)
+      if (transaction.is_internal_transfer) return;
+      if (!transaction.category_id) return;
+
+      // Phase 2: Apply category filtering if user has selected specific categories
+      // This allows users to focus analysis on specific spending/income categories
+      // Uses hierarchical category matching (parent categories include children)
+      if (filterByCategory && !selectedCategoryIds.has(transaction.category_id)) return;
+
+      // Apply date range filtering based on selected period
       const transactionDate = new Date(transaction.date);
-      return transactionDate >= startDate && transactionDate <= endDate;
+      if (transactionDate < startDate || transactionDate > endDate) return;
+
+      analysedTransactions.push(transaction);
+      analysedDates.push(transactionDate);
     });
     
-    // Phase 2: Apply category filtering if user has selected specific categories
-    // This allows users to focus analysis on specific spending/income categories
-    // Uses hierarchical category matching (parent categories include children)
-    const categoryFilteredTransactions = selectedCategories.length > 0 
-      ? filteredTransactions.filter(t => {
-          if (!t.category_id) return false;
-          // Check if transaction category or any parent category is selected
-          return isSelectedCategory(t.category_id, selectedCategories);
-        })
-      : filteredTransactions;
-    
     // Phase 3: Set up data structures for aggregation
     // periodData: Groups transactions by time periods (day/week/month/quarter)
     // categoryBreakdown: Tracks spending within each period for stacked charts
     // expensesByCategory/incomeByCategory: Global category totals for pie charts
+    // simplifiedNames: Display name for each category, worked out once per category
     const periodData = new Map<string, { income: number, expenses: number, date: Date, categoryBreakdown: Map<string, number> }>();
     const expensesByCategory = new Map<string, number>();
     const incomeByCategory = new Map<string, number>();
+    const simplifiedNames = new Map<string, string>();
     
     // Phase 4: Process each transaction and aggregate by time periods
-    categoryFilteredTransactions.forEach(transaction => {
-      const date = new Date(transaction.date);
+    analysedTransactions.forEach((transaction, index) => {
+      const date = analysedDates[index];
+      // Transaction dates arrive as YYYY-MM-DD, so most period keys are
+      // slices of that string. Date-only strings parse as UTC midnight, so
+      // the week start uses UTC fields to stay on the same calendar day.
+      const dateKey: string = transaction.date.slice(0, 10);
       let periodKey: string;
       
       // Generate period key based on selected aggregation level
@@ -344,22 +728,21 @@ const AnalysisView: React.FC = () => {
       switch (aggregation) {
         case 'day':
           // Daily aggregation: Group by exact date (YYYY-MM-DD)
-          periodKey = date.toISOString().split('T')[0];
+          periodKey = dateKey;
           break;
         case 'week':
           // Weekly aggregation: Group by week starting date (Sunday)
-          const weekStart = new Date(date);
-          weekStart.setDate(date.getDate() - date.getDay());
-          periodKey = weekStart.toISOString().split('T')[0];
+          const weekStart = new Date(date.getTime() - date.getUTCDay() * MS_PER_DAY);
+          periodKey = weekStart.toISOString().slice(0, 10);
           break;
         case 'month':
           // Monthly aggregation: Group by year-month (YYYY-MM)
-          periodKey = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
+          periodKey = dateKey.slice(0, 7);
           break;
         case 'quarter':
           // Quarterly aggregation: Group by year-quarter (YYYY-Q1/Q2/Q3/Q4)
-          const quarter = Math.floor(date.getMonth() / 3) + 1;
-          periodKey = `${date.getFullYear()}-Q${quarter}`;
+          const quarter = Math.floor((Number(dateKey.slice(5, 7)) - 1) / 3) + 1;
+          periodKey = `${dateKey.slice(0, 4)}-Q${quarter}`;
           break;
       }
       
@@ -371,7 +754,11 @@ const AnalysisView: React.FC = () => {
       const data = periodData.get(periodKey)!;
       
       const category = transaction.category_name || transaction.category_id;
-      const simplifiedCategory = category.split('/').pop() || category;
+      let simplifiedCategory = simplifiedNames.get(category);
+      if (simplifiedCategory === undefined) {
+        simplifiedCategory = category.split('/').pop() || category;
+        simplifiedNames.set(category, simplifiedCategory);
+      }
 
       if (transaction.deposit > 0) {
         data.income += transaction.deposit;
@@ -390,16 +777,30 @@ const AnalysisView: React.FC = () => {
       }
     });
     
+    // Always calculate cumulative data (will be used conditionally in charts)
+    // The running totals are filled in while the data points are built
+    let cumulativeIncome = 0;
+    let cumulativeExpenses = 0;
+    let cumulativeNet = 0;
+
     // Convert to chart data with category breakdown
     const sortedPeriods = Array.from(periodData.entries())
       .sort(([, dataA], [, dataB]) => dataA.date.getTime() - dataB.date.getTime())
       .map(([period, data]) => {
+        const net = data.income - data.expenses;
+        cumulativeIncome += data.income;
+        cumulativeExpenses += data.expenses;
+        cumulativeNet += net;
+
         const result: any = {
           period,
           income: data.income,
           expenses: data.expenses,
-          net: data.income - data.expenses,
-          date: data.date
+          net,
+          date: data.date,
+          cumulativeIncome,
+          cumulativeExpenses,
+          cumulativeNet
         };
         
         // Add category breakdown for stacked charts
@@ -410,34 +811,6 @@ const AnalysisView: React.FC = () => {
         return result;
       });
     
-    // Always calculate cumulative data (will be used conditionally in charts)
-    let cumulativeIncome = 0;
-    let cumulativeExpenses = 0;
-    let cumulativeNet = 0;
-    
-    sortedPeriods.forEach(item => {
-      cumulativeIncome += item.income;
-      cumulativeExpenses += item.expenses;
-      cumulativeNet += item.net;
-      
-      (item as any).cumulativeIncome = cumulativeIncome;
-      (item as any).cumulativeExpenses = cumulativeExpenses;
-      (item as any).cumulativeNet = cumulativeNet;
-    });
-    
-    // Always calculate averages (will be used conditionally in charts)
-    if (sortedPeriods.length > 0) {
-      const avgIncome = sortedPeriods.reduce((sum, item) => sum + item.income, 0) / sortedPeriods.length;
-      const avgExpenses = sortedPeriods.reduce((sum, item) => sum + item.expenses, 0) / sortedPeriods.length;
-      const avgNet = sortedPeriods.reduce((sum, item) => sum + item.net, 0) / sortedPeriods.length;
-      
-      sortedPeriods.forEach(item => {
-        (item as any).avgIncome = avgIncome;
-        (item as any).avgExpenses = avgExpenses;
-        (item as any).avgNet = avgNet;
-      });
-    }
-    
     // Category data for pie chart with "Other" grouping
     const totalExpenses = Array.from(expensesByCategory.values()).reduce((sum, amount) => sum + amount, 0);
     const expenseCategories = Array.from(expensesByCategory.entries())
@@ -472,69 +845,33 @@ const AnalysisView: React.FC = () => {
       }))
       .sort((a, b) => b.amount - a.amount);
     
-    setCategoryData(categoryChartData);
-    setIncomeCategoryData(incomeCategories);
-    setMonthlyData(sortedPeriods);
-    
-    // Store the original expense categories (without "Other" grouping) for the breakdown table
-    setExpenseCategoriesData(expenseCategories);
-  };
+    const result: AnalysisResult = {
+      categoryData: categoryChartData,
+      incomeCategoryData: incomeCategories,
+      monthlyData: sortedPeriods,
+      // Store the original expense categories (without "Other" grouping) for the breakdown table
+      expenseCategoriesData: expenseCategories
+    };
 
-
-  const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8', '#82CA9D', '#8DD1E1', '#D084D0'];
-  
-  const getCategoryColor = (categoryName: string, index: number) => {
-    return categoryName === 'Other' ? '#000000' : COLORS[index % COLORS.length];
+    // Evict the oldest entry once the cache is full (Maps iterate in insertion order)
+    const results = analysisCache.current.results;
+    if (results.size >= ANALYSIS_CACHE_SIZE) {
+      results.delete(results.keys().next().value!);
+    }
+    results.set(cacheKey, result);
+    applyAnalysisResult(result);
   };
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('en-AU', {
-      style: 'currency',
-      currency: 'AUD'
-    }).format(value);
+  const applyAnalysisResult = (result: AnalysisResult) => {
+    setCategoryData(result.categoryData);
+    setIncomeCategoryData(result.incomeCategoryData);
+    setMonthlyData(result.monthlyData);
+    setExpenseCategoriesData(result.expenseCategoriesData);
   };
 
 
-  const getTotalIncome = () => {
-    return monthlyData.reduce((sum, item) => sum + item.income, 0);
-  };
-
-  const getTotalExpenses = () => {
-    return categoryData.reduce((sum, category) => sum + category.amount, 0);
-  };
 
-  const getNetIncome = () => {
-    return monthlyData.reduce((sum, item) => sum + item.net, 0);
-  };
   
-  const formatPeriodLabel = (period: string, date?: Date) => {
-    if (!date) return period;
-    
-    switch (aggregation) {
-      case 'day':
-        return date.toLocaleDateString('en-AU', { month: 'short', day: 'numeric' });
-      case 'week':
-        return `Week ${date.toLocaleDateString('en-AU', { month: 'short', day: 'numeric' })}`;
-      case 'month':
-        return date.toLocaleDateString('en-AU', { month: 'short', year: 'numeric' });
-      case 'quarter':
-        return period;
-      default:
-        return period;
-    }
-  };
-  
-  const isSelectedCategory = (categoryId: string, selectedIds: string[]): boolean => {
-    if (selectedIds.includes(categoryId)) return true;
-    
-    // Check if any parent category is selected
-    const category = categories.find(c => c.id === categoryId);
-    if (category?.parent_id) {
-      return isSelectedCategory(category.parent_id, selectedIds);
-    }
-    
-    return false;
-  };
   
   const getAllChildCategories = (categoryId: string): string[] => {
     const children: string[] = [];
@@ -641,10 +978,7 @@ const AnalysisView: React.FC = () => {
     
     // Filter transactions by selected categories if any are selected, always exclude uncategorised
     const relevantTransactions = selectedCategories.length > 0 
-      ? transactions.filter(t => {
-          if (!t.category_id) return false;
-          return isSelectedCategory(t.category_id, selectedCategories);
-        })
+      ? transactions.filter(t => t.category_id && selectedCategoryIds.has(t.category_id))
       : transactions.filter(t => t.category_id); // Exclude uncategorised transactions
     
     if (relevantTransactions.length === 0) return;
@@ -737,6 +1071,10 @@ const AnalysisView: React.FC = () => {
     });
   };
   
+  // Kept stable between renders so the memoised chart only re-renders when
+  // the selection actually changes
+  const stackedCategoryNames = useMemo(getSelectedCategoryNames, [categories, selectedCategories]);
+
   if (loading) {
     return (
       <div className="flex items-center justify-center h-full">
@@ -1055,139 +1393,23 @@ const AnalysisView: React.FC = () => {
                 </div>
               </div>
             </div>
-            <ResponsiveContainer width="100%" height={350}>
-              {chartType === 'line' ? (
-                <LineChart data={monthlyData}>
-                  <CartesianGrid strokeDasharray="3 3" />
-                  <XAxis 
-                    dataKey="period" 
-                    tickFormatter={(value) => {
-                      const dataItem = monthlyData.find(item => item.period === value);
-                      return formatPeriodLabel(value, dataItem?.date);
-                    }}
-                  />
-                  <YAxis tickFormatter={(value) => `$${(value / 1000).toFixed(1)}k`} />
-                  <Tooltip 
-                    formatter={(value) => formatCurrency(Number(value))} 
-                    labelFormatter={(label, payload) => {
-                      if (payload && payload[0]) {
-                        return formatPeriodLabel(label, payload[0].payload.date);
-                      }
-                      return label;
-                    }}
-                  />
-                  <Legend />
-                  {showIncome && (
-                    <Line 
-                      type="monotone" 
-                      dataKey={showCumulative ? "cumulativeIncome" : "income"} 
-                      stroke="#22C55E" 
-                      strokeWidth={2}
-                      name={showCumulative ? "Cumulative Income" : "Income"}
-                    />
-                  )}
-                  {showExpenses && (
-                    <Line 
-                      type="monotone" 
-                      dataKey={showCumulative ? "cumulativeExpenses" : "expenses"} 
-                      stroke="#EF4444" 
-                      strokeWidth={2}
-                      name={showCumulative ? "Cumulative Expenses" : "Expenses"}
-                    />
-                  )}
-                  <Line 
-                    type="monotone" 
-                    dataKey={showCumulative ? "cumulativeNet" : "net"} 
-                    stroke="#3B82F6" 
-                    strokeWidth={2}
-                    name={showCumulative ? "Cumulative Net" : "Net"}
-                  />
-                  {/* No averages for line charts */}
-                  <Brush dataKey="period" height={30} />
-                </LineChart>
-              ) : (
-                <BarChart data={monthlyData}>
-                  <CartesianGrid strokeDasharray="3 3" />
-                  <XAxis 
-                    dataKey="period" 
-                    tickFormatter={(value) => {
-                      const dataItem = monthlyData.find(item => item.period === value);
-                      return formatPeriodLabel(value, dataItem?.date);
-                    }}
-                  />
-                  <YAxis tickFormatter={(value) => `$${(value / 1000).toFixed(1)}k`} />
-                  <Tooltip 
-                    formatter={(value) => formatCurrency(Number(value))} 
-                    labelFormatter={(label, payload) => {
-                      if (payload && payload[0]) {
-                        return formatPeriodLabel(label, payload[0].payload.date);
-                      }
-                      return label;
-                    }}
-                  />
-                  <Legend />
-                  {showIncome && (
-                    <Bar 
-                      dataKey="income" 
-                      fill="#22C55E" 
-                      name="Income"
-                      stackId={chartType === 'stacked' ? 'stack' : undefined}
-                    />
-                  )}
-                  {showExpenses && chartType === 'stacked' && selectedCategories.length > 0 ? (
-                    // Show individual categories in stacked view
-                    getSelectedCategoryNames().map((categoryName, index) => (
-                      <Bar 
-                        key={categoryName}
-                        dataKey={categoryName}
-                        fill={COLORS[index % COLORS.length]} 
-                        name={categoryName}
-                        stackId="expenses"
-                      />
-                    ))
-                  ) : showExpenses ? (
-                    <Bar 
-                      dataKey="expenses" 
-                      fill="#EF4444" 
-                      name="Expenses"
-                      stackId={chartType === 'stacked' ? 'stack' : undefined}
-                    />
-                  ) : null}
-                  {/* Average lines - only for bar charts */}
-                  {showAverages && showIncome && (chartType === 'grouped' || chartType === 'stacked') && monthlyData.length > 0 && (
-                    <ReferenceLine y={(monthlyData[0] as any)?.avgIncome || 0} stroke="#22C55E" strokeDasharray="5 5" label="Avg Income" />
-                  )}
-                  {showAverages && showExpenses && (chartType === 'grouped' || chartType === 'stacked') && monthlyData.length > 0 && (
-                    <ReferenceLine y={(monthlyData[0] as any)?.avgExpenses || 0} stroke="#EF4444" strokeDasharray="5 5" label="Avg Expenses" />
-                  )}
-                  <Brush dataKey="period" height={30} />
-                </BarChart>
-              )}
-            </ResponsiveContainer>
+            <IncomeExpenseChart
+              data={monthlyData}
+              aggregation={aggregation}
+              chartType={chartType}
+              showIncome={showIncome}
+              showExpenses={showExpenses}
+              showCumulative={showCumulative}
+              showAverages={showAverages}
+              averages={periodTotals.averages}
+              stackedCategoryNames={stackedCategoryNames}
+            />
           </div>
 
           {/* Expense Categories (Pie Chart) */}
           <div className="bg-white dark:bg-gray-800 rounded-lg shadow-sm border border-gray-200 dark:border-gray-700 p-6">
             <h3 className="text-lg font-semibold text-gray-800 mb-4">Expense Breakdown</h3>
-            <ResponsiveContainer width="100%" height={350}>
-              <PieChart>
-                <Pie
-                  data={categoryData}
-                  cx="50%"
-                  cy="50%"
-                  labelLine={false}
-                  label={({ name, percentage }) => `${name} (${percentage.toFixed(1)}%)`}
-                  outerRadius={120}
-                  fill="#8884d8"
-                  dataKey="amount"
-                >
-                  {categoryData.map((category, index) => (
-                    <Cell key={`cell-${index}`} fill={getCategoryColor(category.name, index)} />
-                  ))}
-                </Pie>
-                <Tooltip formatter={(value) => formatCurrency(Number(value))} />
-              </PieChart>
-            </ResponsiveContainer>
+            <ExpenseBreakdownChart data={categoryData} />
           </div>
         </div>
 
@@ -1200,7 +1422,7 @@ const AnalysisView: React.FC = () => {
               </div>
               <div className="ml-3">
                 <p className="text-sm font-medium text-green-600">Income</p>
-                <p className="text-2xl font-semibold text-green-900">{formatCurrency(getTotalIncome())}</p>
+                <p className="text-2xl font-semibold text-green-900">{formatCurrency(periodTotals.income)}</p>
               </div>
             </div>
           </div>
@@ -1212,20 +1434,20 @@ const AnalysisView: React.FC = () => {
               </div>
               <div className="ml-3">
                 <p className="text-sm font-medium text-red-600">Expenses</p>
-                <p className="text-2xl font-semibold text-red-900">{formatCurrency(getTotalExpenses())}</p>
+                <p className="text-2xl font-semibold text-red-900">{formatCurrency(totalExpenses)}</p>
               </div>
             </div>
           </div>
 
-          <div className={`${getNetIncome() >= 0 ? 'bg-green-50' : 'bg-red-50'} rounded-lg p-4`}>
+          <div className={`${periodTotals.net >= 0 ? 'bg-green-50' : 'bg-red-50'} rounded-lg p-4`}>
             <div className="flex items-center">
-              <div className={`p-2 ${getNetIncome() >= 0 ? 'bg-green-100' : 'bg-red-100'} rounded-lg`}>
-                <DollarSign className={`w-6 h-6 ${getNetIncome() >= 0 ? 'text-green-600' : 'text-red-600'}`} />
+              <div className={`p-2 ${periodTotals.net >= 0 ? 'bg-green-100' : 'bg-red-100'} rounded-lg`}>
+                <DollarSign className={`w-6 h-6 ${periodTotals.net >= 0 ? 'text-green-600' : 'text-red-600'}`} />
               </div>
               <div className="ml-3">
-                <p className={`text-sm font-medium ${getNetIncome() >= 0 ? 'text-green-600' : 'text-red-600'}`}>Net Income</p>
-                <p className={`text-2xl font-semibold ${getNetIncome() >= 0 ? 'text-green-900' : 'text-red-900'}`}>
-                  {formatCurrency(getNetIncome())}
+                <p className={`text-sm font-medium ${periodTotals.net >= 0 ? 'text-green-600' : 'text-red-600'}`}>Net Income</p>
+                <p className={`text-2xl font-semibold ${periodTotals.net >= 0 ? 'text-green-900' : 'text-red-900'}`}>
+                  {formatCurrency(periodTotals.net)}
                 </p>
               </div>
             </div>
@@ -1236,121 +1458,87 @@ const AnalysisView: React.FC = () => {
         <div className="bg-white dark:bg-gray-800 rounded-lg shadow-sm border border-gray-200 dark:border-gray-700 p-6 mt-6">
           <h3 className="text-lg font-semibold text-gray-800 mb-4">Categories Breakdown</h3>
           <div className="overflow-x-auto">
-            {(() => {
-              // Combine income and expense data
-              const incomeMap = new Map(incomeCategoryData.map(cat => [cat.name, cat.amount]));
-              const expenseMap = new Map(expenseCategoriesData.map(cat => [cat.name, cat.amount]));
-              
-              // Get all unique category names
-              const allCategoryNames = new Set([
-                ...incomeCategoryData.map(cat => cat.name),
-                ...expenseCategoriesData.map(cat => cat.name)
-              ]);
-              
-              // Create combined data with net calculations
-              const combinedData = Array.from(allCategoryNames).map(name => {
-                const income = incomeMap.get(name) || 0;
-                const expense = expenseMap.get(name) || 0;
-                const net = income - expense;
-                
-                return {
-                  name,
-                  income,
-                  expense,
-                  net,
-                  totalAmount: Math.abs(net)
-                };
-              }).sort((a, b) => b.net - a.net); // Sort by net (highest income to lowest expense)
-              
-              // Calculate max absolute value for bar width scaling
-              const maxAbsValue = Math.max(...combinedData.map(cat => 
-                Math.max(cat.income, cat.expense, Math.abs(cat.net))
-              ));
-              
-              return (
-                <table className="min-w-full divide-y divide-gray-200">
-                  <thead className="bg-gray-50">
-                    <tr>
-                      <th className="px-4 py-3 text-left text-xs font-medium text-gray-600 uppercase tracking-wider w-1/4">
-                        Category
-                      </th>
-                      <th className="px-4 py-3 text-right text-xs font-medium text-green-600 uppercase tracking-wider w-1/5">
-                        Income
-                      </th>
-                      <th className="px-4 py-3 text-right text-xs font-medium text-red-600 uppercase tracking-wider w-1/5">
-                        Expenses
-                      </th>
-                      <th className="px-4 py-3 text-center text-xs font-medium text-gray-600 uppercase tracking-wider w-2/5">
-                        Net Amount
-                      </th>
+            <table className="min-w-full divide-y divide-gray-200">
+              <thead className="bg-gray-50">
+                <tr>
+                  <th className="px-4 py-3 text-left text-xs font-medium text-gray-600 uppercase tracking-wider w-1/4">
+                    Category
+                  </th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-green-600 uppercase tracking-wider w-1/5">
+                    Income
+                  </th>
+                  <th className="px-4 py-3 text-right text-xs font-medium text-red-600 uppercase tracking-wider w-1/5">
+                    Expenses
+                  </th>
+                  <th className="px-4 py-3 text-center text-xs font-medium text-gray-600 uppercase tracking-wider w-2/5">
+                    Net Amount
+                  </th>
+                </tr>
+              </thead>
+              <tbody className="bg-white dark:bg-gray-800 divide-y divide-gray-200 dark:divide-gray-700">
+                {combinedData.map((category, index) => {
+                  const netBarWidth = maxAbsValue > 0 ? (Math.abs(category.net) / maxAbsValue) * 100 : 0;
+                  const isPositive = category.net >= 0;
+                  
+                  return (
+                    <tr key={index} className="hover:bg-gray-50">
+                      <td className="px-4 py-4 whitespace-nowrap text-sm font-medium text-gray-900">
+                        {category.name}
+                      </td>
+                      <td className="px-4 py-4 whitespace-nowrap text-sm text-right">
+                        {category.income > 0 ? (
+                          <span className="text-green-600 font-medium">
+                            {formatCurrency(category.income)}
+                          </span>
+                        ) : (
+                          <span className="text-gray-400">—</span>
+                        )}
+                      </td>
+                      <td className="px-4 py-4 whitespace-nowrap text-sm text-right">
+                        {category.expense > 0 ? (
+                          <span className="text-red-600 font-medium">
+                            {formatCurrency(category.expense)}
+                          </span>
+                        ) : (
+                          <span className="text-gray-400">—</span>
+                        )}
+                      </td>
+                      <td className="px-4 py-4 whitespace-nowrap">
+                        <div className="flex items-center justify-center space-x-2">
+                          <div className="flex-1 flex items-center justify-end">
+                            <span className={`text-sm font-medium ${isPositive ? 'text-green-600' : 'text-red-600'}`}>
+                              {formatCurrency(Math.abs(category.net))}
+                            </span>
+                          </div>
+                          <div className="w-24 h-4 bg-gray-200 rounded-full relative overflow-hidden">
+                            <div 
+                              className={`h-full rounded-full transition-all duration-300 ${
+                                isPositive ? 'bg-green-400' : 'bg-red-400'
+                              }`}
+                              style={{ width: `${netBarWidth}%` }}
+                            />
+                          </div>
+                          <div className="flex-1 flex items-center justify-start">
+                            <span className={`text-xs ${
+                              isPositive ? 'text-green-600' : 'text-red-600'
+                            }`}>
+                              {category.net !== 0 ? `${((Math.abs(category.net) / (periodTotals.income + totalExpenses)) * 100).toFixed(1)}%` : '0%'}
+                            </span>
+                          </div>
+                        </div>
+                      </td>
                     </tr>
-                  </thead>
-                  <tbody className="bg-white dark:bg-gray-800 divide-y divide-gray-200 dark:divide-gray-700">
-                    {combinedData.map((category, index) => {
-                      const netBarWidth = maxAbsValue > 0 ? (Math.abs(category.net) / maxAbsValue) * 100 : 0;
-                      const isPositive = category.net >= 0;
-                      
-                      return (
-                        <tr key={index} className="hover:bg-gray-50">
-                          <td className="px-4 py-4 whitespace-nowrap text-sm font-medium text-gray-900">
-                            {category.name}
-                          </td>
-                          <td className="px-4 py-4 whitespace-nowrap text-sm text-right">
-                            {category.income > 0 ? (
-                              <span className="text-green-600 font-medium">
-                                {formatCurrency(category.income)}
-                              </span>
-                            ) : (
-                              <span className="text-gray-400">—</span>
-                            )}
-                          </td>
-                          <td className="px-4 py-4 whitespace-nowrap text-sm text-right">
-                            {category.expense > 0 ? (
-                              <span className="text-red-600 font-medium">
-                                {formatCurrency(category.expense)}
-                              </span>
-                            ) : (
-                              <span className="text-gray-400">—</span>
-                            )}
-                          </td>
-                          <td className="px-4 py-4 whitespace-nowrap">
-                            <div className="flex items-center justify-center space-x-2">
-                              <div className="flex-1 flex items-center justify-end">
-                                <span className={`text-sm font-medium ${isPositive ? 'text-green-600' : 'text-red-600'}`}>
-                                  {formatCurrency(Math.abs(category.net))}
-                                </span>
-                              </div>
-                              <div className="w-24 h-4 bg-gray-200 rounded-full relative overflow-hidden">
-                                <div 
-                                  className={`h-full rounded-full transition-all duration-300 ${
-                                    isPositive ? 'bg-green-400' : 'bg-red-400'
-                                  }`}
-                                  style={{ width: `${netBarWidth}%` }}
-                                />
-                              </div>
-                              <div className="flex-1 flex items-center justify-start">
-                                <span className={`text-xs ${
-                                  isPositive ? 'text-green-600' : 'text-red-600'
-                                }`}>
-                                  {category.net !== 0 ? `${((Math.abs(category.net) / (getTotalIncome() + getTotalExpenses())) * 100).toFixed(1)}%` : '0%'}
-                                </span>
-                              </div>
-                            </div>
-                          </td>
-                        </tr>
-                      );
-                    })}
-                    {combinedData.length === 0 && (
-                      <tr>
-                        <td colSpan={4} className="px-4 py-6 text-center text-sm text-gray-500">
-                          No categories found for selected period
-                        </td>
-                      </tr>
-                    )}
-                  </tbody>
-                </table>
-              );
-            })()}
+                  );
+                })}
+                {combinedData.length === 0 && (
+                  <tr>
+                    <td colSpan={4} className="px-4 py-6 text-center text-sm text-gray-500">
+                      No categories found for selected period
+                    </td>
+                  </tr>
+                )}
+              </tbody>
+            </table>
           </div>
           
           {/* Legend */}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { Plus, Edit, Trash2, Play, Settings, Search } from 'lucide-react';
 import axios from 'axios';
 import AddRuleDialog from './dialogs/AddRuleDialog';
@@ -18,10 +18,81 @@ interface AutoCategorizeRule {
     operator?: string;
     description_text: string;
     case_sensitive: boolean;
+    match_type?: string;
     sequence: number;
   }>;
 }
 
+const MATCH_TYPE_LABELS: Record<string, string> = {
+  contains: 'contains',
+  starts_with: 'starts with',
+  ends_with: 'ends with',
+  equals: 'equals'
+};
+
+// Rows rendered up front, and added each time the table is scrolled near
+// its end, so large rule sets don't render rows nobody scrolls to
+const RULE_ROWS_PAGE_SIZE = 100;
+
+// A rule with its table cells formatted, built once each time the rules load
+interface RuleRow {
+  rule: AutoCategorizeRule;
+  categoryName: string;
+  descriptionText: string;
+  amountText: string;
+  searchFields: string[];
+}
+
+const currencyFormatter = new Intl.NumberFormat('en-AU', {
+  style: 'currency',
+  currency: 'AUD'
+});
+
+const formatCurrency = (value: number) => currencyFormatter.format(value);
+
+// Amount criteria text for each amount operator
+const AMOUNT_CRITERIA_FORMATTERS: Record<string, (value: number, value2?: number) => string> = {
+  equals: (value) => `Amount = ${formatCurrency(value)}`,
+  greater_than: (value) => `Amount > ${formatCurrency(value)}`,
+  less_than: (value) => `Amount < ${formatCurrency(value)}`,
+  between: (value, value2) => `Amount between ${formatCurrency(value)} and ${formatCurrency(value2 || 0)}`
+};
+
+const formatAmountCriteria = (rule: AutoCategorizeRule) => {
+  if (!rule.amount_operator || !rule.amount_value) return '';
+
+  const formatter = AMOUNT_CRITERIA_FORMATTERS[rule.amount_operator];
+  return formatter ? formatter(rule.amount_value, rule.amount_value2) : '';
+};
+
+const formatDescriptions = (descriptions: AutoCategorizeRule['descriptions']) => {
+  if (descriptions.length === 0) return 'No description criteria';
+
+  return descriptions.map((desc, index) => {
+    const prefix = index === 0 ? '' : (desc.operator || 'AND');
+    const matchNote = MATCH_TYPE_LABELS[desc.match_type || 'contains'] || 'contains';
+    const caseNote = desc.case_sensitive ? '' : ' (case-insensitive)';
+    return `${prefix} ${matchNote} "${desc.description_text}"${caseNote}`;
+  }).join(' ');
+};
+
+const toRuleRow = (rule: AutoCategorizeRule): RuleRow => {
+  const categoryName = rule.category_id === '0' ? 'Internal Transfer' : (rule.category_name || rule.category_id);
+  const searchFields = [categoryName.toLowerCase()];
+  if (rule.account_name) {
+    searchFields.push(rule.account_name.toLowerCase());
+  }
+  rule.descriptions.forEach(desc => searchFields.push(desc.description_text.toLowerCase()));
+
+  return {
+    rule,
+    categoryName,
+    descriptionText: formatDescriptions(rule.descriptions),
+    amountText: formatAmountCriteria(rule) || 'Any amount',
+    searchFields
+  };
+};
+
 const AutoCategorizeRulesView: React.FC = () => {
   const [rules, setRules] = useState<AutoCategorizeRule[]>([]);
   const [loading, setLoading] = useState(true);
@@ -29,14 +100,17 @@ const AutoCategorizeRulesView: React.FC = () => {
   const [showAddDialog, setShowAddDialog] = useState(false);
   const [editingRule, setEditingRule] = useState<AutoCategorizeRule | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
+  const [visibleRowCount, setVisibleRowCount] = useState(RULE_ROWS_PAGE_SIZE);
 
   useEffect(() => {
     fetchRules();
   }, []);
 
   const fetchRules = async () => {
+    // Only the first load shows the loading screen. Reloads after a rule is
+    // saved keep the table mounted and swap the rules in with one update,
+    // rather than tearing the table down and building it again.
     try {
-      setLoading(true);
       const response = await axios.get<AutoCategorizeRule[]>('http://localhost:8000/api/auto-categorisation/rules');
       setRules(response.data);
       setError(null);
@@ -55,7 +129,8 @@ const AutoCategorizeRulesView: React.FC = () => {
 
     try {
       await axios.delete(`http://localhost:8000/api/auto-categorisation/rules/${ruleId}`);
-      fetchRules(); // Refresh the list
+      // Drop just the deleted rule rather than reloading the whole list
+      setRules(prevRules => prevRules.filter(rule => rule.id !== ruleId));
     } catch (err) {
       console.error('Error deleting rule:', err);
       alert('Failed to delete rule');
@@ -72,56 +147,41 @@ const AutoCategorizeRulesView: React.FC = () => {
     }
   };
 
-  const formatAmountCriteria = (rule: AutoCategorizeRule) => {
-    if (!rule.amount_operator || !rule.amount_value) return '';
-    
-    const formatCurrency = (value: number) => {
-      return new Intl.NumberFormat('en-AU', {
-        style: 'currency',
-        currency: 'AUD'
-      }).format(value);
-    };
-
-    switch (rule.amount_operator) {
-      case 'equals':
-        return `Amount = ${formatCurrency(rule.amount_value)}`;
-      case 'greater_than':
-        return `Amount > ${formatCurrency(rule.amount_value)}`;
-      case 'less_than':
-        return `Amount < ${formatCurrency(rule.amount_value)}`;
-      case 'between':
-        return `Amount between ${formatCurrency(rule.amount_value)} and ${formatCurrency(rule.amount_value2 || 0)}`;
-      default:
-        return '';
+  // Format and sort the rows once per load; searching only filters them
+  const ruleRows = useMemo(
+    () => rules.map(toRuleRow).sort((a, b) => a.categoryName.localeCompare(b.categoryName)),
+    [rules]
+  );
+
+  const filteredRules = useMemo(() => {
+    if (!searchTerm) return ruleRows;
+    const searchLower = searchTerm.toLowerCase();
+    return ruleRows.filter(row => row.searchFields.some(field => field.includes(searchLower)));
+  }, [ruleRows, searchTerm]);
+
+  const handleTableScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const { scrollTop, clientHeight, scrollHeight } = e.currentTarget;
+    if (scrollTop + clientHeight >= scrollHeight - clientHeight && visibleRowCount < filteredRules.length) {
+      setVisibleRowCount(count => count + RULE_ROWS_PAGE_SIZE);
     }
   };
 
-  const formatDescriptions = (descriptions: AutoCategorizeRule['descriptions']) => {
-    if (descriptions.length === 0) return 'No description criteria';
-    
-    return descriptions.map((desc, index) => {
-      const prefix = index === 0 ? '' : (desc.operator || 'AND');
-      const caseNote = desc.case_sensitive ? '' : ' (case-insensitive)';
-      return `${prefix} "${desc.description_text}"${caseNote}`;
-    }).join(' ');
-  };
+  const rulesById = useMemo(() => new Map(rules.map(rule => [rule.id, rule])), [rules]);
 
-  const filteredRules = rules
-    .filter(rule => {
-      if (!searchTerm) return true;
-      const searchLower = searchTerm.toLowerCase();
-      const displayName = rule.category_id === '0' ? 'Internal Transfer' : (rule.category_name || rule.category_id);
-      return (
-        displayName.toLowerCase().includes(searchLower) ||
-        rule.account_name?.toLowerCase().includes(searchLower) ||
-        rule.descriptions.some(desc => desc.description_text.toLowerCase().includes(searchLower))
-      );
-    })
-    .sort((a, b) => {
-      const aName = a.category_id === '0' ? 'Internal Transfer' : (a.category_name || a.category_id);
-      const bName = b.category_id === '0' ? 'Internal Transfer' : (b.category_name || b.category_id);
-      return aName.localeCompare(bName);
-    });
+  // One click handler for the whole table: the edit and delete buttons carry
+  // the rule id and action, rather than each row binding its own handlers
+  const handleRuleAction = (e: React.MouseEvent<HTMLTableSectionElement>) => {
+    const button = (e.target as HTMLElement).closest<HTMLButtonElement>('button[data-action]');
+    const rule = button && rulesById.get(Number(button.dataset.ruleId));
+    if (!button || !rule) return;
+
+    if (button.dataset.action === 'edit') {
+      setEditingRule(rule);
+      setShowAddDialog(true);
+    } else if (button.dataset.action === 'delete') {
+      handleDeleteRule(rule.id);
+    }
+  };
 
   if (loading) {
     return (
@@ -172,7 +232,10 @@ const AutoCategorizeRulesView: React.FC = () => {
               placeholder="Search rules by category, account, or description..."
               className="bg-transparent border-none py-2 px-1 flex-1 focus:outline-none focus:ring-1 focus:ring-indigo-500 rounded-md text-gray-900 dark:text-gray-100 placeholder-gray-500 dark:placeholder-gray-400"
               value={searchTerm}
-              onChange={(e) => setSearchTerm(e.target.value)}
+              onChange={(e) => {
+                setSearchTerm(e.target.value);
+                setVisibleRowCount(RULE_ROWS_PAGE_SIZE);
+              }}
             />
           </div>
         </div>
@@ -220,50 +283,53 @@ const AutoCategorizeRulesView: React.FC = () => {
       </div>
 
       {/* Rules Table */}
-      <div className="flex-1 overflow-auto">
-        <table className="min-w-full divide-y divide-gray-200 dark:divide-gray-700">
+      <div className="flex-1 overflow-auto" onScroll={handleTableScroll}>
+        {/* Fixed layout with set column widths: the browser sizes columns from
+            the header row instead of measuring every rule row, including
+            each time more rows are rendered while scrolling */}
+        <table className="w-full table-fixed divide-y divide-gray-200 dark:divide-gray-700">
           <thead className="bg-gray-50 dark:bg-gray-900">
             <tr>
-              <th scope="col" className="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
+              <th scope="col" className="w-48 px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Category
               </th>
               <th scope="col" className="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Description Criteria
               </th>
-              <th scope="col" className="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
+              <th scope="col" className="w-56 px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Amount Criteria
               </th>
-              <th scope="col" className="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
+              <th scope="col" className="w-48 px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Account
               </th>
-              <th scope="col" className="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
+              <th scope="col" className="w-28 px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Status
               </th>
-              <th scope="col" className="px-6 py-3 text-right text-xs font-medium text-gray-500 uppercase tracking-wider">
+              <th scope="col" className="w-28 px-6 py-3 text-right text-xs font-medium text-gray-500 uppercase tracking-wider">
                 Actions
               </th>
             </tr>
           </thead>
-          <tbody className="bg-white dark:bg-gray-800 divide-y divide-gray-200 dark:divide-gray-700">
-            {filteredRules.map((rule) => (
+          <tbody className="bg-white dark:bg-gray-800 divide-y divide-gray-200 dark:divide-gray-700" onClick={handleRuleAction}>
+            {filteredRules.slice(0, visibleRowCount).map(({ rule, categoryName, descriptionText, amountText }) => (
               <tr key={rule.id} className="hover:bg-gray-50 dark:hover:bg-gray-700">
                 <td className="px-6 py-4 whitespace-nowrap">
-                  <div className="text-sm font-medium text-gray-900 dark:text-gray-100">
-                    {rule.category_id === '0' ? 'Internal Transfer' : (rule.category_name || rule.category_id)}
+                  <div className="text-sm font-medium text-gray-900 dark:text-gray-100 truncate" title={categoryName}>
+                    {categoryName}
                   </div>
                 </td>
                 <td className="px-6 py-4">
-                  <div className="text-sm text-gray-900 dark:text-gray-100 max-w-xs truncate" title={formatDescriptions(rule.descriptions)}>
-                    {formatDescriptions(rule.descriptions)}
+                  <div className="text-sm text-gray-900 dark:text-gray-100 truncate" title={descriptionText}>
+                    {descriptionText}
                   </div>
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap">
-                  <div className="text-sm text-gray-900 dark:text-gray-100">
-                    {formatAmountCriteria(rule) || 'Any amount'}
+                  <div className="text-sm text-gray-900 dark:text-gray-100 truncate" title={amountText}>
+                    {amountText}
                   </div>
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap">
-                  <div className="text-sm text-gray-900 dark:text-gray-100">
+                  <div className="text-sm text-gray-900 dark:text-gray-100 truncate">
                     {rule.account_name || 'Any account'}
                   </div>
                 </td>
@@ -279,16 +345,15 @@ const AutoCategorizeRulesView: React.FC = () => {
                 <td className="px-6 py-4 whitespace-nowrap text-right text-sm font-medium space-x-2">
                   <button 
                     className="text-indigo-600 hover:text-indigo-900"
-                    onClick={() => {
-                      setEditingRule(rule);
-                      setShowAddDialog(true);
-                    }}
+                    data-action="edit"
+                    data-rule-id={rule.id}
                   >
                     <Edit size={16} />
                   </button>
                   <button 
                     className="text-red-600 hover:text-red-900"
-                    onClick={() => handleDeleteRule(rule.id)}
+                    data-action="delete"
+                    data-rule-id={rule.id}
                   >
                     <Trash2 size={16} />
                   </button>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo, useCallback, memo } from 'react';
 import { X, Plus, Trash2 } from 'lucide-react';
 import axios from 'axios';
 import CategoryPickerDialog from './CategoryPickerDialog';
@@ -18,6 +18,7 @@ interface AutoCategorizeRule {
     operator?: string;
     description_text: string;
     case_sensitive: boolean;
+    match_type?: string;
     sequence: number;
   }>;
 }
@@ -33,6 +34,67 @@ interface BankAccount {
   name: string;
 }
 
+type DescriptionCondition = AutoCategorizeRule['descriptions'][number];
+
+interface DescriptionConditionRowProps {
+  condition: DescriptionCondition;
+  index: number;
+  canRemove: boolean;
+  onChange: (index: number, field: string, value: any) => void;
+  onRemove: (index: number) => void;
+}
+
+// Memoised so editing one condition only re-renders that condition's row
+const DescriptionConditionRow = memo(({ condition, index, canRemove, onChange, onRemove }: DescriptionConditionRowProps) => (
+  <div className="flex items-center space-x-2">
+    {index > 0 && (
+      <select
+        className="w-20 border border-gray-300 rounded-md px-2 py-2"
+        value={condition.operator || 'AND'}
+        onChange={(e) => onChange(index, 'operator', e.target.value)}
+      >
+        <option value="AND">AND</option>
+        <option value="OR">OR</option>
+      </select>
+    )}
+    <select
+      className="w-32 border border-gray-300 rounded-md px-2 py-2"
+      value={condition.match_type || 'contains'}
+      onChange={(e) => onChange(index, 'match_type', e.target.value)}
+    >
+      <option value="contains">Contains</option>
+      <option value="starts_with">Starts with</option>
+      <option value="ends_with">Ends with</option>
+      <option value="equals">Equals</option>
+    </select>
+    <input
+      type="text"
+      className="flex-1 border border-gray-300 rounded-md px-3 py-2"
+      placeholder="Text to match in transaction description"
+      value={condition.description_text}
+      onChange={(e) => onChange(index, 'description_text', e.target.value)}
+      required
+    />
+    <label className="flex items-center space-x-1">
+      <input
+        type="checkbox"
+        checked={condition.case_sensitive}
+        onChange={(e) => onChange(index, 'case_sensitive', e.target.checked)}
+      />
+      <span className="text-sm">Case sensitive</span>
+    </label>
+    {canRemove && (
+      <button
+        type="button"
+        className="text-red-600 hover:text-red-800"
+        onClick={() => onRemove(index)}
+      >
+        <Trash2 size={16} />
+      </button>
+    )}
+  </div>
+));
+
 interface AddRuleDialogProps {
   isOpen: boolean;
   onClose: () => void;
@@ -54,7 +116,7 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
     account_id: '',
     date_range: '',
     apply_future: true,
-    descriptions: [{ description_text: '', case_sensitive: false, sequence: 0 }]
+    descriptions: [{ description_text: '', case_sensitive: false, match_type: 'contains', sequence: 0 }]
   });
 
   const [categories, setCategories] = useState<Category[]>([]);
@@ -63,11 +125,22 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
   const [showCategoryPicker, setShowCategoryPicker] = useState(false);
   const [isInternalTransfer, setIsInternalTransfer] = useState(false);
 
+  // The dialog stays mounted while the rules view is open, so categories
+  // (only used to show the selected category's name) and the account list
+  // are loaded once rather than every time it opens; categories are
+  // refetched if the picker returns one created since
+  useEffect(() => {
+    fetchCategories();
+    fetchAccounts();
+  }, []);
+
+  const categoriesById = useMemo(
+    () => new Map(categories.map(category => [category.id, category])),
+    [categories]
+  );
+
   useEffect(() => {
     if (isOpen) {
-      fetchCategories();
-      fetchAccounts();
-      
       if (editingRule) {
         setFormData(editingRule);
         setIsInternalTransfer(editingRule.category_id === '0');
@@ -80,7 +153,7 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
           account_id: '',
           date_range: '',
           apply_future: true,
-          descriptions: [{ description_text: '', case_sensitive: false, sequence: 0 }]
+          descriptions: [{ description_text: '', case_sensitive: false, match_type: 'contains', sequence: 0 }]
         });
         setIsInternalTransfer(false);
       }
@@ -159,35 +232,41 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
           operator: 'AND',
           description_text: '', 
           case_sensitive: false, 
+          match_type: 'contains',
           sequence: formData.descriptions.length 
         }
       ]
     });
   };
 
-  const removeDescriptionCriteria = (index: number) => {
-    if (formData.descriptions.length > 1) {
-      const newDescriptions = formData.descriptions.filter((_, i) => i !== index);
-      setFormData({
-        ...formData,
+  // Functional updates keep these callbacks stable across renders, so the
+  // memoised condition rows that receive them can skip re-rendering
+  const removeDescriptionCriteria = useCallback((index: number) => {
+    setFormData(prevData => {
+      if (prevData.descriptions.length <= 1) return prevData;
+      const newDescriptions = prevData.descriptions.filter((_, i) => i !== index);
+      return {
+        ...prevData,
         descriptions: newDescriptions.map((desc, i) => ({
           ...desc,
           sequence: i,
           operator: i === 0 ? undefined : desc.operator
         }))
-      });
-    }
-  };
+      };
+    });
+  }, []);
 
-  const updateDescription = (index: number, field: string, value: any) => {
-    const newDescriptions = [...formData.descriptions];
-    newDescriptions[index] = { ...newDescriptions[index], [field]: value };
-    setFormData({ ...formData, descriptions: newDescriptions });
-  };
+  const updateDescription = useCallback((index: number, field: string, value: any) => {
+    setFormData(prevData => {
+      const newDescriptions = [...prevData.descriptions];
+      newDescriptions[index] = { ...newDescriptions[index], [field]: value };
+      return { ...prevData, descriptions: newDescriptions };
+    });
+  }, []);
 
   const getSelectedCategoryName = () => {
     if (isInternalTransfer) return 'Internal Transfer';
-    const category = categories.find(c => c.id === formData.category_id);
+    const category = categoriesById.get(formData.category_id);
     return category?.name || formData.category_id;
   };
 
@@ -284,43 +363,14 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
               </label>
               <div className="space-y-3">
                 {formData.descriptions.map((desc, index) => (
-                  <div key={index} className="flex items-center space-x-2">
-                    {index > 0 && (
-                      <select
-                        className="w-20 border border-gray-300 rounded-md px-2 py-2"
-                        value={desc.operator || 'AND'}
-                        onChange={(e) => updateDescription(index, 'operator', e.target.value)}
-                      >
-                        <option value="AND">AND</option>
-                        <option value="OR">OR</option>
-                      </select>
-                    )}
-                    <input
-                      type="text"
-                      className="flex-1 border border-gray-300 rounded-md px-3 py-2"
-                      placeholder="Text to match in transaction description"
-                      value={desc.description_text}
-                      onChange={(e) => updateDescription(index, 'description_text', e.target.value)}
-                      required
-                    />
-                    <label className="flex items-center space-x-1">
-                      <input
-                        type="checkbox"
-                        checked={desc.case_sensitive}
-                        onChange={(e) => updateDescription(index, 'case_sensitive', e.target.checked)}
-                      />
-                      <span className="text-sm">Case sensitive</span>
-                    </label>
-                    {formData.descriptions.length > 1 && (
-                      <button
-                        type="button"
-                        className="text-red-600 hover:text-red-800"
-                        onClick={() => removeDescriptionCriteria(index)}
-                      >
-                        <Trash2 size={16} />
-                      </button>
-                    )}
-                  </div>
+                  <DescriptionConditionRow
+                    key={index}
+                    condition={desc}
+                    index={index}
+                    canRemove={formData.descriptions.length > 1}
+                    onChange={updateDescription}
+                    onRemove={removeDescriptionCriteria}
+                  />
                 ))}
                 <button
                   type="button"
@@ -431,6 +481,9 @@ const AddRuleDialog: React.FC<AddRuleDialogProps> = ({
         onCategorySelect={(categoryId) => {
           setFormData({ ...formData, category_id: categoryId });
           setShowCategoryPicker(false);
+          if (!categoriesById.has(categoryId)) {
+            fetchCategories();
+          }
         }}
         currentCategoryId={formData.category_id}
       />
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useMemo, useRef, useDeferredValue, startTransition } from 'react';
 import { X, Search, FolderOpen, Folder } from 'lucide-react';
 import axios from 'axios';
 
@@ -11,8 +11,22 @@ interface Category {
   is_bank_account: boolean;
   children?: Category[];
   expanded?: boolean;
+  searchName?: string; // Lowercased name, set when the tree is built
+  isTransaction?: boolean; // Whether this is a selectable transaction category, set when the tree is built
 }
 
+// Lowercased name for search matching, computed once per category
+const getSearchName = (category: Category) => category.searchName ?? category.name.toLowerCase();
+
+const isTransactionCategory = (category: Category) =>
+  category.isTransaction ?? category.category_type === 'transaction';
+
+// Category tree from the last successful fetch. The next time the picker
+// opens it is shown straight away while a fresh copy loads.
+let cachedCategoryTree: Category[] | null = null;
+
+const NO_CATEGORIES: Category[] = [];
+
 interface CategoryPickerDialogProps {
   isOpen: boolean;
   onClose: () => void;
@@ -32,9 +46,15 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
 }) => {
   const [categories, setCategories] = useState<Category[]>([]);
   const [searchTerm, setSearchTerm] = useState('');
+  // The search text the tree is currently filtered by, which trails
+  // searchTerm until typing pauses
+  const [filterText, setFilterText] = useState('');
   const [selectedCategory, setSelectedCategory] = useState<string | null>(currentCategoryId || null);
   const [loading, setLoading] = useState(false);
   const searchInputRef = useRef<HTMLInputElement>(null);
+  // The tree shown in the list. While the picker is closed this is empty, so
+  // on opening the dialog paints first and the tree renders right after it.
+  const listedCategories = useDeferredValue(isOpen ? categories : NO_CATEGORIES);
 
   // Sample data matching the existing structure
   const sampleCategories: Category[] = [
@@ -180,9 +200,26 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
     }
   }, [isOpen]);
 
+  // Filter the tree once typing pauses rather than on every keystroke
+  useEffect(() => {
+    const timeoutId = setTimeout(() => {
+      // Re-filtering the tree is a non-urgent update, so React can render it
+      // in the background and drop it if the user starts typing again
+      startTransition(() => {
+        setFilterText(searchTerm);
+      });
+    }, searchTerm ? 150 : 0); // Clearing the search applies immediately
+
+    return () => clearTimeout(timeoutId);
+  }, [searchTerm]);
+
   const fetchCategories = async () => {
     try {
-      setLoading(true);
+      if (cachedCategoryTree) {
+        setCategories(cachedCategoryTree);
+      } else {
+        setLoading(true);
+      }
       const response = await axios.get<Category[]>('http://localhost:8000/api/categories');
       
       // Build tree structure from flat list
@@ -191,7 +228,13 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
 
       // First pass: create all category objects
       response.data.forEach(cat => {
-        categoryMap.set(cat.id, { ...cat, children: [], expanded: true });
+        categoryMap.set(cat.id, {
+          ...cat,
+          children: [],
+          expanded: true,
+          searchName: cat.name.toLowerCase(),
+          isTransaction: cat.category_type === 'transaction'
+        });
       });
 
       // Second pass: build tree structure
@@ -208,11 +251,14 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
         }
       });
 
+      cachedCategoryTree = rootCategories;
       setCategories(rootCategories);
     } catch (err) {
       console.error('Error fetching categories:', err);
-      // Fallback to sample data
-      setCategories(sampleCategories);
+      // Fallback to sample data, unless an earlier fetch can still be shown
+      if (!cachedCategoryTree) {
+        setCategories(sampleCategories);
+      }
     } finally {
       setLoading(false);
     }
@@ -249,71 +295,104 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
     return 'text-gray-600';
   };
 
-  const getMatchingTransactionCategories = (cats: Category[]): Category[] => {
-    const matches: Category[] = [];
-    
-    const searchCategories = (categories: Category[]) => {
-      categories.forEach(cat => {
-        const matchesSearch = searchTerm === '' || 
-          cat.name.toLowerCase().includes(searchTerm.toLowerCase());
-        
-        if (matchesSearch && cat.category_type === 'transaction') {
-          matches.push(cat);
+  // Lowercased once per render rather than for every category compared
+  const filterLower = filterText.toLowerCase();
+
+  // Flat lookup of every category in the tree by id
+  const categoriesById = useMemo(() => {
+    const byId = new Map<string, Category>();
+    const stack = [...categories];
+    while (stack.length > 0) {
+      const category = stack.pop()!;
+      byId.set(category.id, category);
+      category.children?.forEach(child => stack.push(child));
+    }
+    return byId;
+  }, [categories]);
+
+  // Selectable categories offered as suggestions by the search box
+  const transactionCategories = useMemo(() => {
+    return Array.from(categoriesById.values())
+      .filter(isTransactionCategory)
+      .sort((a, b) => a.name.localeCompare(b.name));
+  }, [categoriesById]);
+
+  // Ids of categories whose own name or any descendant's name matches the
+  // filter, worked out in one post-order pass so rendering is a set lookup.
+  // The same pass notes up to two matching transaction categories, which is
+  // all auto-select needs to tell whether exactly one matched.
+  const { matchingIds, matchingTransactionCategories } = useMemo(() => {
+    const ids = new Set<string>();
+    const transactionMatches: Category[] = [];
+    if (filterLower === '') {
+      return { matchingIds: ids, matchingTransactionCategories: transactionMatches };
+    }
+
+    // Each category is pushed twice: once to queue its children, and again
+    // to be checked after all of them have been
+    const stack: Array<[Category, boolean]> = categories.map(cat => [cat, false]);
+    while (stack.length > 0) {
+      const [category, childrenVisited] = stack.pop()!;
+      if (!childrenVisited) {
+        stack.push([category, true]);
+        category.children?.forEach(child => stack.push([child, false]));
+      } else {
+        const matchesSearch = getSearchName(category).includes(filterLower);
+        if (
+          matchesSearch &&
+          isTransactionCategory(category) &&
+          transactionMatches.length < 2
+        ) {
+          transactionMatches.push(category);
         }
-        
-        if (cat.children) {
-          searchCategories(cat.children);
+        if (matchesSearch || category.children?.some(child => ids.has(child.id))) {
+          ids.add(category.id);
         }
-      });
-    };
-    
-    searchCategories(cats);
-    return matches;
-  };
+      }
+    }
+    return { matchingIds: ids, matchingTransactionCategories: transactionMatches };
+  }, [categories, filterLower]);
 
   // Auto-select when only one transaction category matches
   useEffect(() => {
-    if (searchTerm && searchTerm.length >= 2) {
-      const matchingCategories = getMatchingTransactionCategories(categories);
-      if (matchingCategories.length === 1) {
-        setSelectedCategory(matchingCategories[0].id);
+    if (filterText && filterText.length >= 2) {
+      if (matchingTransactionCategories.length === 1) {
+        setSelectedCategory(matchingTransactionCategories[0].id);
       }
     }
-  }, [searchTerm, categories]);
+  }, [filterText, matchingTransactionCategories]);
 
   const renderCategory = (category: Category, level: number = 0) => {
     const hasChildren = category.children && category.children.length > 0;
     const paddingLeft = level * 24;
-    const isTransactionCategory = category.category_type === 'transaction';
-    const matchesSearch = searchTerm === '' || 
-      category.name.toLowerCase().includes(searchTerm.toLowerCase());
+    const isTransaction = isTransactionCategory(category);
 
-    if (!matchesSearch && !hasChildren) return null;
+    if (filterLower !== '' && !matchingIds.has(category.id)) return null;
+    // While searching, open just the groups leading to a match, leaving each
+    // group's own expanded state to come back when the search is cleared
+    const isExpanded = filterLower !== '' || category.expanded;
 
     return (
       <div key={category.id}>
         <div 
           className={`flex items-center py-2 px-3 hover:bg-gray-50 cursor-pointer ${
             selectedCategory === category.id ? 'bg-indigo-50 border-r-2 border-indigo-500' : ''
-          } ${!isTransactionCategory ? 'cursor-default' : ''}`}
-          style={{ paddingLeft: `${paddingLeft + 12}px` }}
-          onClick={() => {
-            if (isTransactionCategory) {
-              setSelectedCategory(category.id);
-            } else if (hasChildren) {
-              toggleExpanded(category.id);
-            }
+          } ${!isTransaction ? 'cursor-default' : ''}`}
+          style={{
+            paddingLeft: `${paddingLeft + 12}px`,
+            // Let the browser skip layout and paint for rows scrolled out of
+            // view, sizing them at a typical row height until first shown
+            contentVisibility: 'auto',
+            containIntrinsicSize: 'auto 36px'
           }}
+          data-category-id={category.id}
         >
           {hasChildren && (
             <button
-              onClick={(e) => {
-                e.stopPropagation();
-                toggleExpanded(category.id);
-              }}
+              data-action="toggle"
               className="mr-1 p-1 hover:bg-gray-200 rounded"
             >
-              {category.expanded ? (
+              {isExpanded ? (
                 <svg className="w-3 h-3" fill="currentColor" viewBox="0 0 20 20">
                   <path fillRule="evenodd" d="M5.293 7.293a1 1 0 011.414 0L10 10.586l3.293-3.293a1 1 0 111.414 1.414l-4 4a1 1 0 01-1.414 0l-4-4a1 1 0 010-1.414z" clipRule="evenodd" />
                 </svg>
@@ -333,7 +412,7 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
           <div className="flex-1">
             <div className={`text-sm ${getCategoryTypeColor(category)}`}>
               {category.name}
-              {!isTransactionCategory && (
+              {!isTransaction && (
                 <span className="text-xs text-gray-400 ml-1">(Group)</span>
               )}
             </div>
@@ -342,7 +421,7 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
             )}
           </div>
 
-          {isTransactionCategory && selectedCategory === category.id && (
+          {isTransaction && selectedCategory === category.id && (
             <div className="text-indigo-600">
               <svg className="w-4 h-4" fill="currentColor" viewBox="0 0 20 20">
                 <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
@@ -351,7 +430,7 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
           )}
         </div>
         
-        {hasChildren && category.expanded && (
+        {hasChildren && isExpanded && (
           <div>
             {category.children!.map(child => renderCategory(child, level + 1))}
           </div>
@@ -360,6 +439,23 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
     );
   };
 
+  // One click handler for the whole list, finding the row from its data attribute
+  const handleCategoryClick = (e: React.MouseEvent<HTMLDivElement>) => {
+    const target = e.target as HTMLElement;
+    const row = target.closest<HTMLElement>('[data-category-id]');
+    const category = row && categoriesById.get(row.dataset.categoryId!);
+    if (!category) return;
+
+    const hasChildren = category.children && category.children.length > 0;
+    if (target.closest('button[data-action="toggle"]')) {
+      toggleExpanded(category.id);
+    } else if (isTransactionCategory(category)) {
+      setSelectedCategory(category.id);
+    } else if (hasChildren) {
+      toggleExpanded(category.id);
+    }
+  };
+
   const handleSelect = () => {
     if (selectedCategory) {
       onCategorySelect(selectedCategory);
@@ -367,20 +463,34 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
     }
   };
 
-  const getSelectedCategoryName = () => {
-    const findCategory = (cats: Category[]): string | null => {
-      for (const cat of cats) {
-        if (cat.id === selectedCategory) {
-          return cat.name;
-        }
-        if (cat.children) {
-          const found = findCategory(cat.children);
-          if (found) return found;
+  // Enter can arrive before the debounced filter has caught up with the search
+  // box, so the auto-select it would make is worked out from the typed text
+  // here instead of submitting a selection that is about to be replaced
+  const handleSearchEnter = () => {
+    let categoryId = selectedCategory;
+    if (searchTerm !== filterText && searchTerm.length >= 2) {
+      const searchLower = searchTerm.toLowerCase();
+      const matches: Category[] = [];
+      for (const category of transactionCategories) {
+        if (getSearchName(category).includes(searchLower)) {
+          matches.push(category);
+          if (matches.length > 1) break;
         }
       }
-      return null;
-    };
-    return findCategory(categories);
+      if (matches.length === 1) {
+        categoryId = matches[0].id;
+      }
+    }
+
+    if (categoryId) {
+      onCategorySelect(categoryId);
+      onClose();
+    }
+  };
+
+  const getSelectedCategoryName = () => {
+    if (!selectedCategory) return null;
+    return categoriesById.get(selectedCategory)?.name ?? null;
   };
 
   if (!isOpen) return null;
@@ -438,25 +548,31 @@ const CategoryPickerDialog: React.FC<CategoryPickerDialogProps> = ({
               type="text"
               placeholder="Search categories..."
               className="w-full pl-10 pr-4 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-1 focus:ring-indigo-500"
+              list="category-picker-suggestions"
               value={searchTerm}
               onChange={(e) => setSearchTerm(e.target.value)}
               onKeyDown={(e) => {
-                if (e.key === 'Enter' && selectedCategory) {
-                  handleSelect();
+                if (e.key === 'Enter') {
+                  handleSearchEnter();
                 }
               }}
             />
+            <datalist id="category-picker-suggestions">
+              {transactionCategories.map(category => (
+                <option key={category.id} value={category.name} />
+              ))}
+            </datalist>
           </div>
         </div>
 
         {/* Category List */}
-        <div className="flex-1 overflow-auto p-2">
+        <div className="flex-1 overflow-auto p-2" onClick={handleCategoryClick}>
           {loading ? (
             <div className="flex items-center justify-center py-8">
               <div className="text-gray-500">Loading categories...</div>
             </div>
           ) : (
-            categories.map(category => renderCategory(category))
+            listedCategories.map(category => renderCategory(category))
           )}
         </div>
 
@@ -54,6 +54,22 @@ class DatabaseManager:
         self.conn = sqlite3.connect(self.db_path)
         # Enable foreign key constraints for referential integrity
         self.conn.execute("PRAGMA foreign_keys = ON")
+        # Keep temporary tables in memory and allow a 64 MB page cache
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        self.conn.execute("PRAGMA cache_size = -64000")
+        # Read through a memory map of the file (up to 256 MB) rather than
+        # copying pages into the cache; speeds up the large duplicate and
+        # transfer scans during imports
+        self.conn.execute("PRAGMA mmap_size = 268435456")
+        # SQLite's lower() and LIKE only fold ASCII letters; rules matching
+        # non-ASCII text case-insensitively lowercase through Python instead.
+        # NULL passes through as NULL, like lower(), so a transaction without
+        # a description just doesn't match rather than failing the statement
+        self.conn.create_function(
+            "py_lower", 1,
+            lambda text: text.lower() if text is not None else None,
+            deterministic=True
+        )
         
         if schema_path.exists():
             with schema_path.open() as f:
@@ -89,6 +105,25 @@ class DatabaseManager:
         cursor.execute(query, parameters)
         return cursor
     
+    def executemany(self, query: str, seq_of_parameters):
+        """
+        Execute a parameterized query once for each parameter set.
+        
+        Prefer this over calling execute() in a loop for bulk inserts and
+        updates: the statement is prepared once and the rows are bound and
+        stepped in a single call.
+        
+        Args:
+            query: SQL query string to execute (use ? placeholders for parameters)
+            seq_of_parameters: Iterable of parameter sequences, one per execution
+            
+        Returns:
+            Database cursor. cursor.rowcount holds the total rows modified.
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany(query, seq_of_parameters)
+        return cursor
+    
     def cursor(self):
         """
         Get a database cursor for manual query execution.
@@ -109,5 +144,8 @@ class DatabaseManager:
     def close(self):
         """Close the database connection."""
         if self.conn:
+            # Re-analyse any tables whose statistics the queries run on
+            # this connection found missing or out of date
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
             self.conn = None
\ No newline at end of file
@@ -5,15 +5,96 @@ This module provides comprehensive transaction management functionality includin
 transaction import, categorisation, duplicate detection, and auto-categorisation rules.
 """
 
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from decimal import Decimal
+from itertools import groupby
 from typing import Optional, List, Dict
 from enum import Enum
 from utils.qif_parser import QIFTransaction
 from utils.csv_parser import CSVTransaction
 from models.category_model import CategoryType
 
+# A rule's amount condition tests the withdrawal, or the deposit when there is
+# no withdrawal, as a positive value
+_RULE_AMOUNT_SQL = "ABS(CASE WHEN withdrawal != 0 THEN withdrawal ELSE COALESCE(deposit, 0) END)"
+
+_AMOUNT_CONDITION_SQL = {
+    "Equal to": f"ABS({_RULE_AMOUNT_SQL} - ?) < 0.01",
+    "Greater than": f"{_RULE_AMOUNT_SQL} > ?",
+    "Less than": f"{_RULE_AMOUNT_SQL} < ?",
+    "Between": f"{_RULE_AMOUNT_SQL} BETWEEN ? AND ?",
+}
+
+# How a description condition's text is placed in a LIKE (case-insensitive)
+# or GLOB (case-sensitive) pattern, keyed by match type
+_LIKE_PATTERNS = {
+    "contains": "%{}%",
+    "starts_with": "{}%",
+    "ends_with": "%{}",
+    "equals": "{}",
+}
+_GLOB_PATTERNS = {
+    "contains": "*{}*",
+    "starts_with": "{}*",
+    "ends_with": "*{}",
+    "equals": "{}",
+}
+
+def _like_pattern(match_text: str, match_type: str) -> str:
+    """Build a LIKE pattern for a description condition, with wildcards escaped by backslash"""
+    escaped = match_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return _LIKE_PATTERNS[match_type].format(escaped)
+
+def _glob_pattern(match_text: str, match_type: str) -> str:
+    """Build a GLOB pattern for a description condition, with wildcards escaped by brackets"""
+    escaped = ''.join(f"[{char}]" if char in '*?[' else char for char in match_text)
+    return _GLOB_PATTERNS[match_type].format(escaped)
+
+def _split_amount(amount) -> tuple[float, float]:
+    """Split a signed amount into (withdrawal, deposit) as stored in the database"""
+    return (float(-amount), 0.0) if amount < 0 else (0.0, float(amount))
+
+def _to_cents(amount) -> int:
+    """Convert a currency amount to whole cents for exact comparisons"""
+    return int(round(amount * 100))
+
+def _split_amount_cents(amount) -> tuple[float, float, int, int]:
+    """Split a signed amount into (withdrawal, deposit, withdrawal_cents, deposit_cents)"""
+    withdrawal, deposit = _split_amount(amount)
+    return withdrawal, deposit, _to_cents(withdrawal), _to_cents(deposit)
+
+# Number of rows sent to executemany at a time when importing
+_IMPORT_BATCH_SIZE = 1000
+
+# Column list read by _row_to_transaction
+_TRANSACTIONS_QUERY = """
+    SELECT t.id, t.date, t.account, ba.name as account_name, t.description, t.withdrawal, t.deposit, 
+           t.category_id, c.name as category_name, t.tax_type, t.is_tax_deductible, 
+           t.is_hidden, t.is_matched, t.is_internal_transfer, t.balance, t.transaction_id
+    FROM transactions t
+    LEFT JOIN categories c ON t.category_id = c.id
+    LEFT JOIN bank_accounts ba ON t.account = ba.id
+    WHERE 1=1
+"""
+
+# Complete query per get_transactions filter type, so each filter always
+# sends the same SQL text and hits sqlite3's prepared statement cache
+_TRANSACTION_FILTER_QUERIES = {
+    "uncategorised": _TRANSACTIONS_QUERY + """ AND t.category_id IS NULL 
+                        AND t.is_internal_transfer = 0 
+                        AND t.is_hidden = 0""",
+    "categorised": _TRANSACTIONS_QUERY + """ AND t.category_id IS NOT NULL 
+                        AND t.is_internal_transfer = 0 
+                        AND t.is_hidden = 0""",
+    "internal_transfers": _TRANSACTIONS_QUERY + " AND t.is_internal_transfer = 1",
+    "hidden": _TRANSACTIONS_QUERY + " AND t.is_hidden = 1",
+    # For 'all', don't add any additional filters - show everything
+    "all": _TRANSACTIONS_QUERY,
+}
+# Any other filter type shows non-hidden transactions
+_DEFAULT_TRANSACTION_FILTER_QUERY = _TRANSACTIONS_QUERY + " AND t.is_hidden = 0"
+
 class TaxType(Enum):
     """Enumeration of possible tax types"""
     GST = "GST"    # Goods and Services Tax
@@ -29,8 +110,8 @@ class Transaction:
     account: str
     account_name: Optional[str]
     description: str
-    withdrawal: Decimal
-    deposit: Decimal
+    withdrawal: float
+    deposit: float
     category_id: Optional[str]
     category_name: Optional[str]
     tax_type: TaxType
@@ -38,7 +119,7 @@ class Transaction:
     is_hidden: bool
     is_matched: bool
     is_internal_transfer: bool = False
-    balance: Optional[Decimal] = None
+    balance: Optional[float] = None
     transaction_id: Optional[str] = None
 
 class TransactionModel:
@@ -46,9 +127,14 @@ class TransactionModel:
     def __init__(self, db_manager):
         self.db = db_manager
         self._ensure_transaction_table_updated()
+        self._ensure_rule_tables_updated()
     
     def _ensure_transaction_table_updated(self):
-        """Ensure the transactions table has the new balance and transaction_id columns"""
+        """
+        Ensure the transactions table has the balance, transaction_id and
+        integer cents columns, the indexes used by duplicate detection, and
+        planner statistics for its indexes
+        """
         try:
             # Check if balance column exists
             cursor = self.db.execute("PRAGMA table_info(transactions)")
@@ -60,6 +146,68 @@ class TransactionModel:
             if 'transaction_id' not in columns:
                 self.db.execute("ALTER TABLE transactions ADD COLUMN transaction_id TEXT")
             
+            # Amounts in whole cents let duplicate checks use exact equality
+            # (and an index) instead of ABS(x - y) < 0.01
+            if 'withdrawal_cents' not in columns:
+                self.db.execute("ALTER TABLE transactions ADD COLUMN withdrawal_cents INTEGER")
+                self.db.execute("ALTER TABLE transactions ADD COLUMN deposit_cents INTEGER")
+                self.db.execute("""
+                    UPDATE transactions
+                    SET withdrawal_cents = CAST(ROUND(COALESCE(withdrawal, 0) * 100) AS INTEGER),
+                        deposit_cents = CAST(ROUND(COALESCE(deposit, 0) * 100) AS INTEGER)
+                """)
+            
+            # Created here rather than in schema.sql, which runs before the
+            # cents columns exist on databases created by older versions
+            self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_duplicate_check
+                ON transactions(account, description, date, withdrawal_cents, deposit_cents)
+            """)
+            
+            # find_database_duplicates checks across all accounts, so it needs
+            # the same key without the leading account column. Covers every
+            # column the check reads, so it never touches the table.
+            self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_description_date_amounts
+                ON transactions(description, date, withdrawal_cents, deposit_cents)
+            """)
+
+            # Internal transfer matching looks up the opposite amount within
+            # a day of each transaction, in any other account
+            self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_amounts_date
+                ON transactions(withdrawal_cents, deposit_cents, date)
+            """)
+
+            # CSV imports match on the bank's transaction ID first
+            self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_account_transaction_id
+                ON transactions(account, transaction_id)
+            """)
+            
+            # Let SQLite refresh planner statistics that are missing or stale;
+            # the 0x10000 bit makes it check every table at startup on
+            # SQLite 3.46+. Older versions catch up when the connection closes.
+            self.db.execute("PRAGMA optimize=0x10002")
+            
+            self.db.commit()
+        except Exception as e:
+            pass  # Table already has required columns
+    
+    def _ensure_rule_tables_updated(self):
+        """
+        Ensure rule description conditions have the match_type column
+        """
+        try:
+            cursor = self.db.execute("PRAGMA table_info(auto_categorisation_rule_descriptions)")
+            columns = [row[1] for row in cursor.fetchall()]
+            
+            if 'match_type' not in columns:
+                self.db.execute("""
+                    ALTER TABLE auto_categorisation_rule_descriptions
+                    ADD COLUMN match_type TEXT NOT NULL DEFAULT 'contains'
+                """)
+            
             self.db.commit()
         except Exception as e:
             pass  # Table already has required columns
@@ -78,35 +226,9 @@ class TransactionModel:
         Returns:
             List of filtered transactions
         """
-        query = """
-            SELECT t.id, t.date, t.account, ba.name as account_name, t.description, t.withdrawal, t.deposit, 
-                   t.category_id, c.name as category_name, t.tax_type, t.is_tax_deductible, 
-                   t.is_hidden, t.is_matched, t.is_internal_transfer, t.balance, t.transaction_id
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            LEFT JOIN bank_accounts ba ON t.account = ba.id
-            WHERE 1=1
-        """
+        query = _TRANSACTION_FILTER_QUERIES.get(filter_type, _DEFAULT_TRANSACTION_FILTER_QUERY)
         params = []
         
-        if filter_type == "uncategorised":
-            query += """ AND t.category_id IS NULL 
-                        AND t.is_internal_transfer = 0 
-                        AND t.is_hidden = 0"""
-        elif filter_type == "categorised":
-            query += """ AND t.category_id IS NOT NULL 
-                        AND t.is_internal_transfer = 0 
-                        AND t.is_hidden = 0"""
-        elif filter_type == "internal_transfers":
-            query += " AND t.is_internal_transfer = 1"
-        elif filter_type == "hidden":
-            query += " AND t.is_hidden = 1"
-        elif filter_type == "all":
-            # For 'all', don't add any additional filters - show everything
-            pass
-        else:
-            query += " AND t.is_hidden = 0"  # Default to showing non-hidden
-        
         # Add search filtering at database level
         if search and len(search.strip()) >= 2:
             query += """ AND (t.description LIKE ? OR t.account LIKE ?)"""
@@ -118,7 +240,8 @@ class TransactionModel:
             query += " LIMIT ? OFFSET ?"
             params.extend([limit, offset])
         elif offset > 0:
-            query += " OFFSET ?"
+            # SQLite only accepts OFFSET after a LIMIT; -1 means no limit
+            query += " LIMIT -1 OFFSET ?"
             params.append(offset)
         
         cursor = self.db.execute(query, params)
@@ -135,27 +258,32 @@ class TransactionModel:
             Transaction: A transaction object with all fields populated
         """
         try:
-            tax_type_value = row[9]  # Get the tax_type value from the row (shifted due to account_name and category_name)
-            # If tax_type is None/NULL, default to TaxType.NONE
-            tax_type = TaxType(tax_type_value) if tax_type_value else TaxType.NONE
+            # Unpack once instead of indexing the row per field; the order
+            # matches the column list in _TRANSACTIONS_QUERY
+            (trans_id, date, account, account_name, description, withdrawal, deposit,
+             category_id, category_name, tax_type, is_tax_deductible, is_hidden,
+             is_matched, is_internal_transfer, balance, transaction_id) = row
             
             return Transaction(
-                id=row[0],
-                date=datetime.fromisoformat(row[1]),
-                account=row[2],
-                account_name=row[3],   # New account_name field
-                description=row[4],
-                withdrawal=Decimal(str(row[5])) if row[5] else Decimal('0'),
-                deposit=Decimal(str(row[6])) if row[6] else Decimal('0'),
-                category_id=row[7],
-                category_name=row[8],  # New category_name field
-                tax_type=tax_type,
-                is_tax_deductible=bool(row[10]),   # Shifted indices
-                is_hidden=bool(row[11]),
-                is_matched=bool(row[12]),
-                is_internal_transfer=bool(row[13]),  # Get is_internal_transfer from row
-                balance=Decimal(str(row[14])) if row[14] else None,
-                transaction_id=row[15] if row[15] else None
+                id=trans_id,
+                date=datetime.fromisoformat(date),
+                account=account,
+                account_name=account_name,
+                description=description,
+                # Amounts are stored as REAL, so they are passed through as
+                # floats rather than rebuilt as Decimal for every row
+                withdrawal=withdrawal or 0.0,
+                deposit=deposit or 0.0,
+                category_id=category_id,
+                category_name=category_name,
+                # If tax_type is None/NULL, default to TaxType.NONE
+                tax_type=TaxType(tax_type) if tax_type else TaxType.NONE,
+                is_tax_deductible=bool(is_tax_deductible),
+                is_hidden=bool(is_hidden),
+                is_matched=bool(is_matched),
+                is_internal_transfer=bool(is_internal_transfer),
+                balance=float(balance) if balance else None,
+                transaction_id=transaction_id if transaction_id else None
             )
         except Exception as e:
             raise ValueError(f"Error converting row to transaction: {e}")
@@ -175,24 +303,21 @@ class TransactionModel:
         start_date = (trans.date - timedelta(days=window_days)).isoformat()
         end_date = (trans.date + timedelta(days=window_days)).isoformat()
         
-        # Determine withdrawal/deposit amounts
-        withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-        deposit = float(trans.amount) if trans.amount > 0 else 0.0
-        
-        # Build the description as it would appear in the database
-        description = trans.payee + (f" - {trans.memo}" if trans.memo else '')
+        withdrawal, deposit = _split_amount(trans.amount)
         
-        # Query for matching transactions
+        # Query for matching transactions, stopping at the first hit
         cursor = self.db.execute("""
-            SELECT COUNT(*) FROM transactions
-            WHERE date BETWEEN ? AND ?
-            AND ABS(withdrawal - ?) < 0.01  -- Use small epsilon for float comparison
-            AND ABS(deposit - ?) < 0.01
-            AND description = ?
-        """, (start_date, end_date, withdrawal, deposit, description))
-        
-        count = cursor.fetchone()[0]
-        return count > 0
+            SELECT EXISTS(
+                SELECT 1 FROM transactions
+                WHERE date BETWEEN ? AND ?
+                AND withdrawal_cents = ?
+                AND deposit_cents = ?
+                AND description = ?
+                LIMIT 1
+            )
+        """, (start_date, end_date, _to_cents(withdrawal), _to_cents(deposit), trans.description))
+        
+        return cursor.fetchone()[0] > 0
 
     def import_qif_transactions(self, transactions: List[QIFTransaction], account_id: str) -> tuple[int, int]:
         """
@@ -206,7 +331,6 @@ class TransactionModel:
             tuple[int, int]: (number of transactions imported, number of duplicates skipped)
         """
         try:
-            imported_count = 0
             duplicate_count = 0
             
             # Verify this is a valid bank account
@@ -220,38 +344,55 @@ class TransactionModel:
             if not cursor.fetchone():
                 raise ValueError(f"Invalid bank account ID: {account_id}")
             
+            # Each amount is split once and shared by the duplicate check and insert
+            amounts = [_split_amount_cents(trans.amount) for trans in transactions]
+            
+            # Check the whole file against the account in one query
+            existing_duplicates = self._find_duplicates_in_account(transactions, amounts, account_id)
+            
+            # Rows accepted so far in this import, so that repeats within the
+            # file are still caught now that inserts are deferred to one batch
+            window = timedelta(days=3)
+            accepted: Dict[tuple, List[datetime]] = defaultdict(list)
+            rows = []
+            
             # Process each transaction
-            for trans in transactions:
+            for index, (trans, (withdrawal, deposit, withdrawal_cents, deposit_cents)) in enumerate(
+                    zip(transactions, amounts)):
+                key = (trans.description, withdrawal_cents, deposit_cents)
+                
                 # Skip if it's a duplicate
-                if self.is_duplicate_in_account(trans, account_id):
+                if (index in existing_duplicates
+                        or any(abs(trans.date - date) <= window for date in accepted[key])):
                     duplicate_count += 1
                     continue
                 
-                # Process the transaction
-                withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-                deposit = float(trans.amount) if trans.amount > 0 else 0.0
-                
-                self.db.execute("""
-                    INSERT INTO transactions (
-                        date, account, description, withdrawal, deposit,
-                        is_matched, is_internal_transfer, balance, transaction_id
-                    ) VALUES (?, ?, ?, ?, ?, 0, 0, ?, ?)
-                """, (
+                accepted[key].append(trans.date)
+                rows.append((
                     trans.date.isoformat(),
                     account_id,
-                    trans.payee + (f" - {trans.memo}" if trans.memo else ''),
+                    trans.description,
                     withdrawal,
                     deposit,
-                    None,  # QIF doesn't have balance info
-                    None   # QIF doesn't have transaction ID
+                    withdrawal_cents,
+                    deposit_cents
                 ))
-                
-                imported_count += 1
             
-            self.db.commit()
+            # QIF has no balance or transaction ID, so those stay NULL
+            self._insert_in_batches("""
+                INSERT INTO transactions (
+                    date, account, description, withdrawal, deposit,
+                    withdrawal_cents, deposit_cents,
+                    is_matched, is_internal_transfer
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, 0, 0)
+            """, rows)
+            imported_count = len(rows)
             
-            # After import, detect any internal transfers
-            self.detect_internal_transfers()
+            # Detect any internal transfers in the same transaction, so the
+            # whole import is committed (and synced to disk) once
+            self._mark_internal_transfers(self._transfer_window_start(transactions))
+            
+            self.db.commit()
             
             return imported_count, duplicate_count
             
@@ -276,28 +417,147 @@ class TransactionModel:
             start_date = (trans.date - timedelta(days=window_days)).isoformat()
             end_date = (trans.date + timedelta(days=window_days)).isoformat()
             
-            # Determine withdrawal/deposit amounts
-            withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-            deposit = float(trans.amount) if trans.amount > 0 else 0.0
-            
-            # Build description
-            description = trans.payee + (f" - {trans.memo}" if trans.memo else '')
+            withdrawal, deposit = _split_amount(trans.amount)
             
             # Query for matching transactions in the same account
             cursor = self.db.execute("""
-                SELECT COUNT(*) FROM transactions
-                WHERE date BETWEEN ? AND ?
-                AND account = ?
-                AND ABS(withdrawal - ?) < 0.01
-                AND ABS(deposit - ?) < 0.01
-                AND description = ?
-            """, (start_date, end_date, account_id, withdrawal, deposit, description))
+                SELECT EXISTS(
+                    SELECT 1 FROM transactions
+                    WHERE date BETWEEN ? AND ?
+                    AND account = ?
+                    AND withdrawal_cents = ?
+                    AND deposit_cents = ?
+                    AND description = ?
+                    LIMIT 1
+                )
+            """, (start_date, end_date, account_id, _to_cents(withdrawal), _to_cents(deposit), trans.description))
             
             return cursor.fetchone()[0] > 0
             
         except Exception as e:
             return False
 
+    def _insert_in_batches(self, query: str, rows: List[tuple]):
+        """
+        Insert rows with executemany in fixed-size batches.
+        
+        All batches run inside the caller's transaction, so the import is still
+        committed once at the end.
+        
+        Args:
+            query (str): Parameterised INSERT statement
+            rows (List[tuple]): Parameter tuples, one per row
+        """
+        for start in range(0, len(rows), _IMPORT_BATCH_SIZE):
+            self.db.executemany(query, rows[start:start + _IMPORT_BATCH_SIZE])
+
+    def _stage_incoming_transactions(self, transactions: List[QIFTransaction | CSVTransaction],
+                                     amounts: List[tuple[float, float, int, int]],
+                                     window_days: int):
+        """
+        Load transactions into the incoming_transactions temporary table.
+        
+        Each row holds the transaction's index, its date window, description,
+        amounts in cents and (for CSV) bank transaction ID, so duplicate checks
+        can be run for all of them with one query. Callers empty the table
+        once they are done with it.
+        
+        Args:
+            transactions (List[QIFTransaction | CSVTransaction]): The transactions to load
+            amounts (List[tuple[float, float, int, int]]): Each transaction's amount
+                from _split_amount_cents()
+            window_days (int): Number of days to look around each transaction date
+        """
+        window = timedelta(days=window_days)
+        probes = []
+        for index, (trans, (_, _, withdrawal_cents, deposit_cents)) in enumerate(
+                zip(transactions, amounts)):
+            if isinstance(trans, CSVTransaction):
+                description, transaction_id = trans.payee, trans.transaction_id
+            else:
+                description, transaction_id = trans.description, None
+            probes.append((
+                index,
+                (trans.date - window).isoformat(),
+                (trans.date + window).isoformat(),
+                description,
+                withdrawal_cents,
+                deposit_cents,
+                transaction_id or None
+            ))
+        
+        self.db.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS incoming_transactions (
+                idx INTEGER PRIMARY KEY,
+                start_date TEXT,
+                end_date TEXT,
+                description TEXT,
+                withdrawal_cents INTEGER,
+                deposit_cents INTEGER,
+                transaction_id TEXT
+            )
+        """)
+        self.db.executemany("""
+            INSERT INTO incoming_transactions (
+                idx, start_date, end_date, description,
+                withdrawal_cents, deposit_cents, transaction_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, probes)
+
+    def _find_duplicates_in_account(self, transactions: List[QIFTransaction | CSVTransaction],
+                                    amounts: List[tuple[float, float, int, int]],
+                                    account_id: str, window_days: int = 3) -> set[int]:
+        """
+        Find which transactions already exist in the specified bank account.
+        
+        Set-based equivalent of calling is_duplicate_in_account (or
+        is_duplicate_csv_in_account) for every transaction: the candidates are
+        bulk-loaded into a temporary table and checked against the account
+        with a single query.
+        
+        Args:
+            transactions (List[QIFTransaction | CSVTransaction]): The transactions to check
+            amounts (List[tuple[float, float, int, int]]): Each transaction's amount
+                from _split_amount_cents()
+            account_id (str): The bank account ID to check against
+            window_days (int): Number of days to look around each transaction date
+        
+        Returns:
+            set[int]: Indices into transactions of those with an existing match
+        """
+        if not transactions:
+            return set()
+        
+        try:
+            self._stage_incoming_transactions(transactions, amounts, window_days)
+            
+            # A matching transaction_id is checked first, as in
+            # is_duplicate_csv_in_account, before falling back to the
+            # description, amount and date window
+            cursor = self.db.execute("""
+                SELECT i.idx FROM incoming_transactions i
+                WHERE (
+                    i.transaction_id IS NOT NULL
+                    AND EXISTS (
+                        SELECT 1 FROM transactions t
+                        WHERE t.account = ?1
+                        AND t.transaction_id = i.transaction_id
+                    )
+                )
+                OR EXISTS (
+                    SELECT 1 FROM transactions t
+                    WHERE t.account = ?1
+                    AND t.description = i.description
+                    AND t.date BETWEEN i.start_date AND i.end_date
+                    AND t.withdrawal_cents = i.withdrawal_cents
+                    AND t.deposit_cents = i.deposit_cents
+                )
+            """, (account_id,))
+            
+            return {row[0] for row in cursor}
+        finally:
+            self.db.execute("DELETE FROM incoming_transactions")
+
     def import_csv_transactions(self, transactions: List[CSVTransaction], account_id: str) -> tuple[int, int]:
         """
         Import transactions from CSV format into a specific bank account.
@@ -324,42 +584,64 @@ class TransactionModel:
             if not cursor.fetchone():
                 raise ValueError(f"Invalid bank account ID: {account_id}")
             
+            # Each amount is split once and shared by the duplicate check and insert
+            amounts = [_split_amount_cents(trans.amount) for trans in transactions]
+            
+            # Check the whole file against the account in one query
+            existing_duplicates = self._find_duplicates_in_account(transactions, amounts, account_id)
+            
+            # Rows accepted so far in this import, so that repeats within the
+            # file are still caught now that inserts are deferred to batches
+            window = timedelta(days=3)
+            accepted_ids = set()
+            accepted: Dict[tuple, List[datetime]] = defaultdict(list)
+            rows = []
+            
             # Process each transaction
-            for trans in transactions:
+            for index, (trans, (withdrawal, deposit, withdrawal_cents, deposit_cents)) in enumerate(
+                    zip(transactions, amounts)):
+                key = (trans.payee, withdrawal_cents, deposit_cents)
+                
                 # Skip if it's a duplicate
-                if self.is_duplicate_csv_in_account(trans, account_id):
+                if (index in existing_duplicates
+                        or (trans.transaction_id and trans.transaction_id in accepted_ids)
+                        or any(abs(trans.date - date) <= window for date in accepted[key])):
                     duplicate_count += 1
                     continue
                 
-                # Process the transaction
-                withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-                deposit = float(trans.amount) if trans.amount > 0 else 0.0
-                
-                self.db.execute("""
-                    INSERT INTO transactions (
-                        date, account, description, withdrawal, deposit,
-                        is_matched, is_internal_transfer, balance, transaction_id
-                    ) VALUES (?, ?, ?, ?, ?, 0, 0, ?, ?)
-                """, (
+                if trans.transaction_id:
+                    accepted_ids.add(trans.transaction_id)
+                accepted[key].append(trans.date)
+                rows.append((
                     trans.date.isoformat(),
                     account_id,
                     trans.payee,
                     withdrawal,
                     deposit,
+                    withdrawal_cents,
+                    deposit_cents,
                     float(trans.balance) if trans.balance else None,
                     trans.transaction_id
                 ))
-                
-                imported_count += 1
             
-            self.db.commit()
+            self._insert_in_batches("""
+                INSERT INTO transactions (
+                    date, account, description, withdrawal, deposit,
+                    withdrawal_cents, deposit_cents,
+                    is_matched, is_internal_transfer, balance, transaction_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, 0, 0, ?, ?)
+            """, rows)
+            imported_count = len(rows)
+            
+            # Detect any internal transfers in the same transaction as the import
+            self._mark_internal_transfers(self._transfer_window_start(transactions))
             
-            # After import, update account balance if we have balance data
+            # Update account balance if we have balance data, so it is
+            # committed together with the import
             if transactions:
                 self._update_account_balance_from_csv(transactions, account_id)
             
-            # After import, detect any internal transfers
-            self.detect_internal_transfers()
+            self.db.commit()
             
             return imported_count, duplicate_count
             
@@ -384,8 +666,11 @@ class TransactionModel:
             # If we have a transaction_id, use it for more accurate matching
             if trans.transaction_id:
                 cursor = self.db.execute("""
-                    SELECT COUNT(*) FROM transactions
-                    WHERE account = ? AND transaction_id = ?
+                    SELECT EXISTS(
+                        SELECT 1 FROM transactions
+                        WHERE account = ? AND transaction_id = ?
+                        LIMIT 1
+                    )
                 """, (account_id, trans.transaction_id))
                 
                 if cursor.fetchone()[0] > 0:
@@ -395,17 +680,19 @@ class TransactionModel:
             start_date = (trans.date - timedelta(days=window_days)).isoformat()
             end_date = (trans.date + timedelta(days=window_days)).isoformat()
             
-            withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-            deposit = float(trans.amount) if trans.amount > 0 else 0.0
+            withdrawal, deposit = _split_amount(trans.amount)
             
             cursor = self.db.execute("""
-                SELECT COUNT(*) FROM transactions
-                WHERE date BETWEEN ? AND ?
-                AND account = ?
-                AND ABS(withdrawal - ?) < 0.01
-                AND ABS(deposit - ?) < 0.01
-                AND description = ?
-            """, (start_date, end_date, account_id, withdrawal, deposit, trans.payee))
+                SELECT EXISTS(
+                    SELECT 1 FROM transactions
+                    WHERE date BETWEEN ? AND ?
+                    AND account = ?
+                    AND withdrawal_cents = ?
+                    AND deposit_cents = ?
+                    AND description = ?
+                    LIMIT 1
+                )
+            """, (start_date, end_date, account_id, _to_cents(withdrawal), _to_cents(deposit), trans.payee))
             
             return cursor.fetchone()[0] > 0
             
@@ -484,18 +771,21 @@ class TransactionModel:
             rule_id = cursor.lastrowid
             
             # Insert description conditions
-            for i, condition in enumerate(rule_data['description']['conditions']):
-                self.db.execute("""
-                    INSERT INTO auto_categorisation_rule_descriptions (
-                        rule_id, operator, description_text, case_sensitive, sequence
-                    ) VALUES (?, ?, ?, ?, ?)
-                """, (
+            self.db.executemany("""
+                INSERT INTO auto_categorisation_rule_descriptions (
+                    rule_id, operator, description_text, case_sensitive, match_type, sequence
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (
                     rule_id,
                     condition['operator'],
                     condition['text'],
                     condition['case_sensitive'],
+                    condition.get('match_type') or 'contains',
                     i
-                ))
+                )
+                for i, condition in enumerate(rule_data['description']['conditions'])
+            ])
             
             self.db.execute("COMMIT")
             
@@ -517,7 +807,7 @@ class TransactionModel:
             List[Dict]: List of rule dictionaries with all their details
         """
         try:
-            # Get main rules
+            # Get main rules together with their description conditions
             cursor = self.db.execute("""
                 SELECT 
                     r.id,
@@ -532,33 +822,35 @@ class TransactionModel:
                     r.account_id,
                     COALESCE(ba.name, 'Any') as account_name,
                     r.date_range,
-                    r.apply_future
+                    r.apply_future,
+                    d.operator,
+                    d.description_text,
+                    d.case_sensitive,
+                    d.match_type
                 FROM auto_categorisation_rules r
                 LEFT JOIN categories c ON r.category_id = c.id AND r.category_id != '0'
                 LEFT JOIN bank_accounts ba ON r.account_id = ba.id
-                ORDER BY c.name
+                LEFT JOIN auto_categorisation_rule_descriptions d ON r.id = d.rule_id
+                ORDER BY c.name, r.id, d.sequence
             """)
             
             rules = []
-            for row in cursor:
-                rule_id = row[0]
-                
-                # Get description conditions for this rule
-                desc_cursor = self.db.execute("""
-                    SELECT operator, description_text, case_sensitive
-                    FROM auto_categorisation_rule_descriptions
-                    WHERE rule_id = ?
-                    ORDER BY sequence
-                """, (rule_id,))
+            # Rows of the same rule are adjacent, one per description condition
+            for rule_id, group in groupby(cursor, key=lambda row: row[0]):
+                group = list(group)
+                row = group[0]
                 
                 # Convert description conditions to list of dictionaries
-                description_conditions = []
-                for desc_row in desc_cursor:
-                    description_conditions.append({
-                        'operator': desc_row[0],
-                        'text': desc_row[1],
-                        'case_sensitive': bool(desc_row[2])
-                    })
+                description_conditions = [
+                    {
+                        'operator': desc_row[10],
+                        'text': desc_row[11],
+                        'case_sensitive': bool(desc_row[12]),
+                        'match_type': desc_row[13]
+                    }
+                    for desc_row in group
+                    if desc_row[11] is not None  # Rule has no conditions
+                ]
                 
                 rules.append({
                     'id': rule_id,
@@ -625,18 +917,21 @@ class TransactionModel:
             """, (rule_id,))
             
             # Insert new description conditions
-            for i, condition in enumerate(rule_data['description']['conditions']):
-                self.db.execute("""
-                    INSERT INTO auto_categorisation_rule_descriptions (
-                        rule_id, operator, description_text, case_sensitive, sequence
-                    ) VALUES (?, ?, ?, ?, ?)
-                """, (
+            self.db.executemany("""
+                INSERT INTO auto_categorisation_rule_descriptions (
+                    rule_id, operator, description_text, case_sensitive, match_type, sequence
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (
                     rule_id,
                     condition['operator'],
                     condition['text'],
                     condition['case_sensitive'],
+                    condition.get('match_type') or 'contains',
                     i
-                ))
+                )
+                for i, condition in enumerate(rule_data['description']['conditions'])
+            ])
             
             self.db.commit()
             
@@ -672,163 +967,172 @@ class TransactionModel:
             self.db.rollback()
             return False
 
-    def _transaction_matches_rule(self, transaction: Transaction, rule: tuple) -> bool:
+    def _compile_rule(self, rule: tuple, description_conditions: List[tuple],
+                      date_conditions: Dict[str, tuple[str, list]]) -> tuple[str, list]:
         """
-        Check if a transaction matches an auto-categorisation rule
+        Compile an auto-categorisation rule into the UPDATE that applies it
+        
+        The statement only touches uncategorised transactions (without
+        category, not internal transfers and not hidden), so rows matched by
+        an earlier rule are left alone.
         
         Args:
-            transaction: Transaction object to check
-            rule: Tuple from database containing rule criteria
+            rule: Tuple (category_id, account_id, amount_operator, amount_value,
+                  amount_value2, date_range)
+            description_conditions: List of tuples (operator, text, case_sensitive)
+            date_conditions: Date range conditions from _get_date_conditions()
             
         Returns:
-            bool: True if transaction matches rule criteria
+            tuple[str, list]: UPDATE statement and its parameters
         """
-        try:
-            # Extract rule components from tuple
-            (rule_id, category_id, account_id, amount_operator, 
-            amount_value, amount_value2, date_range) = rule
-
-            # Get description conditions for this rule
-            cursor = self.db.execute("""
-                SELECT operator, description_text, case_sensitive
-                FROM auto_categorisation_rule_descriptions
-                WHERE rule_id = ?
-                ORDER BY sequence
-            """, (rule_id,))
-            description_conditions = cursor.fetchall()
-
-            # Check account if specified
-            if account_id and transaction.account != account_id:
-                return False
-
-            # Check description conditions
-            if not self._check_description_conditions(transaction.description, description_conditions):
-                return False
-
-            # Check amount
-            amount = transaction.withdrawal or transaction.deposit
-            if not self._check_amount_condition(amount, amount_operator, amount_value, amount_value2):
-                return False
-
-            # Check date range
-            if not self._check_date_condition(transaction.date, date_range):
-                return False
-
-            return True
-
-        except Exception as e:
-            return False
+        (category_id, account_id, amount_operator,
+         amount_value, amount_value2, date_range) = rule
+        
+        clauses = []
+        params = []
+        
+        if category_id == '0':  # Special case for internal transfers
+            assignment = """category_id = NULL,
+                is_internal_transfer = 1,
+                is_matched = 1"""
+        else:
+            assignment = """category_id = ?,
+                is_internal_transfer = 0,
+                is_matched = 0"""
+            params.append(category_id)
+        
+        # Check account if specified
+        if account_id:
+            clauses.append("account = ?")
+            params.append(account_id)
+        
+        for clause, clause_params in (
+            self._description_condition_sql(description_conditions),
+            self._amount_condition_sql(amount_operator, amount_value, amount_value2),
+            date_conditions.get(date_range, ("1", [])),
+        ):
+            clauses.append(clause)
+            params.extend(clause_params)
+        
+        statement = f"""
+            UPDATE transactions
+            SET {assignment}
+            WHERE category_id IS NULL
+            AND is_internal_transfer = 0
+            AND is_hidden = 0
+            AND {" AND ".join(clauses)}
+        """
+        return statement, params
 
-    def _check_description_conditions(self, description: str, conditions: List[tuple]) -> bool:
+    def _description_condition_sql(self, conditions: List[tuple]) -> tuple[str, list]:
         """
-        Check if a description matches the conditions using AND/OR logic
+        Build a SQL condition matching descriptions using AND/OR logic
+        
+        Conditions are combined left to right, each operator applying to the
+        result so far. Each condition's text is matched literally, as
+        contained in, at the start of, at the end of, or equal to the description.
         
         Args:
-            description: Transaction description to check
-            conditions: List of tuples (operator, text, case_sensitive)
+            conditions: List of tuples (operator, text, case_sensitive, match_type)
             
         Returns:
-            bool: True if description matches the conditions
+            tuple[str, list]: SQL condition and its parameters
         """
         if not conditions:
-            return True
-
-        # First condition (no operator)
-        result = self._check_single_description(
-            description,
-            conditions[0][1],  # description_text
-            conditions[0][2]   # case_sensitive
-        )
-
-        # Process subsequent conditions with operators
-        for condition in conditions[1:]:
-            operator = condition[0]  # AND/OR
-            matches = self._check_single_description(
-                description,
-                condition[1],  # description_text
-                condition[2]   # case_sensitive
-            )
-
-            if operator == 'AND':
-                result = result and matches
+            return "1", []
+        
+        clause = None
+        params = []
+        for operator, match_text, case_sensitive, match_type in conditions:
+            if match_type not in _LIKE_PATTERNS:
+                match_type = "contains"
+            
+            # A fixed prefix (starts with / equals) lets SQLite use an index:
+            # the case-insensitive description index for LIKE and the plain
+            # one for GLOB on the raw description
+            if not case_sensitive and match_text.isascii():
+                # LIKE already ignores ASCII case, so no lowercased copy of
+                # each description is built
+                matches = "description LIKE ? ESCAPE '\\'"
+                params.append(_like_pattern(match_text, match_type))
+            elif not case_sensitive:
+                # LIKE leaves non-ASCII letters case-sensitive, so compare
+                # Python-lowercased descriptions instead
+                if match_type == "contains":
+                    matches = "instr(py_lower(description), ?) > 0"
+                    params.append(match_text.lower())
+                else:
+                    matches = "py_lower(description) GLOB ?"
+                    params.append(_glob_pattern(match_text.lower(), match_type))
+            elif match_type == "contains":
+                matches = "instr(description, ?) > 0"
+                params.append(match_text)
+            else:
+                matches = "description GLOB ?"
+                params.append(_glob_pattern(match_text, match_type))
+            
+            if clause is None:
+                # First condition (no operator)
+                clause = matches
+            elif operator == 'AND':
+                clause = f"({clause} AND {matches})"
             else:  # OR
-                result = result or matches
-
-        return result
-
-    def _check_single_description(self, description: str, match_text: str, case_sensitive: bool) -> bool:
-        """
-        Check if a single description condition matches
+                clause = f"({clause} OR {matches})"
         
-        Args:
-            description: Transaction description to check
-            match_text: Text to match against
-            case_sensitive: Whether to match case sensitively
-            
-        Returns:
-            bool: True if description matches the condition
-        """
-        if not case_sensitive:
-            description = description.lower()
-            match_text = match_text.lower()
-        return match_text in description
+        return clause, params
 
-    def _check_amount_condition(self, amount: Decimal, operator: str, 
-                            value1: Optional[float], value2: Optional[float]) -> bool:
+    def _amount_condition_sql(self, operator: Optional[str], value1: Optional[float],
+                              value2: Optional[float]) -> tuple[str, list]:
         """
-        Check if an amount matches the amount condition
+        Build a SQL condition for a rule's amount constraint
         
         Args:
-            amount: Transaction amount to check
             operator: Comparison operator ("Equal to", "Greater than", etc.)
             value1: Primary comparison value
             value2: Secondary comparison value (for "Between" operator)
             
         Returns:
-            bool: True if amount matches the condition
+            tuple[str, list]: SQL condition and its parameters
         """
         if operator == "Any" or not value1:
-            return True
-
-        amount = abs(amount)  # Work with absolute values
-        value1 = Decimal(str(value1))
-        value2 = Decimal(str(value2)) if value2 else None
-
-        if operator == "Equal to":
-            return abs(amount - value1) < Decimal('0.01')
-        elif operator == "Greater than":
-            return amount > value1
-        elif operator == "Less than":
-            return amount < value1
-        elif operator == "Between" and value2:
-            return value1 <= amount <= value2
-
-        return False
+            return "1", []
+        
+        clause = _AMOUNT_CONDITION_SQL.get(operator)
+        if clause is None:
+            return "0", []  # Unknown operator never matches
+        
+        if operator == "Between":
+            if not value2:
+                return "0", []
+            return clause, [float(value1), float(value2)]
+        
+        return clause, [float(value1)]
 
-    def _check_date_condition(self, trans_date: datetime, date_range: str) -> bool:
+    def _get_date_conditions(self, now: datetime) -> Dict[str, tuple[str, list]]:
         """
-        Check if a date falls within the specified range
+        Resolve each relative date range into a SQL condition
+        
+        Computed once per rule application run so every rule's date condition
+        is measured from the same moment, and looking up a rule's range is a
+        single dict access. Stored dates are ISO strings, so they are compared
+        directly against the ISO form of the bounds.
         
         Args:
-            trans_date: Transaction date to check
-            date_range: Date range specification
+            now: Reference time for the relative ranges
             
         Returns:
-            bool: True if date falls within the range
+            Dict[str, tuple[str, list]]: SQL condition and its parameters keyed
+            by date range; ranges not listed match any date
         """
-        if not date_range or date_range == "Any":
-            return True
-
-        today = datetime.now()
-
-        if date_range == "Last 30 days":
-            return (today - trans_date).days <= 30
-        elif date_range == "Last 90 days":
-            return (today - trans_date).days <= 90
-        elif date_range == "This year":
-            return trans_date.year == today.year
-
-        return True
+        return {
+            # (now - date).days <= N is the same as date > now - (N + 1) days
+            "Last 30 days": ("date > ?", [(now - timedelta(days=31)).isoformat()]),
+            "Last 90 days": ("date > ?", [(now - timedelta(days=91)).isoformat()]),
+            "This year": ("date >= ? AND date < ?", [
+                datetime(now.year, 1, 1).isoformat(),
+                datetime(now.year + 1, 1, 1).isoformat()
+            ]),
+        }
 
     def apply_auto_categorisation_rules(self) -> int:
         """
@@ -841,10 +1145,10 @@ class TransactionModel:
         
         The process:
         1. Retrieve all active rules (apply_future = 1)
-        2. Get all uncategorised transactions 
-        3. For each transaction, test against each rule in order
-        4. Apply the first matching rule and stop processing that transaction
-        5. Handle special cases like internal transfers (category_id = '0')
+        2. For each rule in order, build a SQL condition from its criteria
+        3. Update every still-uncategorised transaction matching that condition
+           in one statement, so earlier rules take priority over later ones
+        4. Handle special cases like internal transfers (category_id = '0')
         
         Rule matching considers:
         - Description patterns (contains/equals/starts with/ends with)
@@ -858,45 +1162,40 @@ class TransactionModel:
         try:
             categorised_count = 0
             
-            # Get all active rules ordered by creation (first created = higher priority)
+            # Get all active rules ordered by creation (first created = higher priority),
+            # together with their description conditions in a single query
             cursor = self.db.execute("""
-                SELECT id, category_id, account_id, amount_operator, 
-                    amount_value, amount_value2, date_range
-                FROM auto_categorisation_rules
-                WHERE apply_future = 1
-                ORDER BY id ASC
+                SELECT r.id, r.category_id, r.account_id, r.amount_operator,
+                    r.amount_value, r.amount_value2, r.date_range,
+                    d.operator, d.description_text, d.case_sensitive, d.match_type
+                FROM auto_categorisation_rules r
+                LEFT JOIN auto_categorisation_rule_descriptions d ON r.id = d.rule_id
+                WHERE r.apply_future = 1
+                ORDER BY r.id ASC, d.sequence
             """)
-            rules = cursor.fetchall()
+            
+            # rule_id -> (rule criteria, description conditions), in rule order
+            rules: Dict[int, tuple] = {}
+            for row in cursor.fetchall():
+                rule_id = row[0]
+                if rule_id not in rules:
+                    rules[rule_id] = (row[1:7], [])
+                if row[8] is not None:
+                    rules[rule_id][1].append(row[7:11])
 
-            # Get uncategorised transactions (transactions without category and not internal transfers)
-            transactions = self.get_transactions("uncategorised")
+            # Relative date ranges are resolved once for the whole run
+            date_conditions = self._get_date_conditions(datetime.now())
 
-            for trans in transactions:
-                for rule in rules:
-                    if self._transaction_matches_rule(trans, rule):
-                        category_id = rule[1]  # rule[1] is category_id
-                        
-                        if category_id == '0':  # Special case for internal transfers
-                            # Apply internal transfer classification
-                            self.db.execute("""
-                                UPDATE transactions
-                                SET category_id = NULL,
-                                    is_internal_transfer = 1,
-                                    is_matched = 1
-                                WHERE id = ?
-                            """, (trans.id,))
-                        else:
-                            # Apply regular category classification
-                            self.db.execute("""
-                                UPDATE transactions
-                                SET category_id = ?,
-                                    is_internal_transfer = 0,
-                                    is_matched = 0
-                                WHERE id = ?
-                            """, (category_id, trans.id))
-                        
-                        categorised_count += 1
-                        break  # Stop after first matching rule (priority ordering)
+            # Every rule is compiled before any of them runs; rules of the same
+            # shape compile to the same SQL text and share a prepared statement
+            compiled_rules = [
+                self._compile_rule(rule, description_conditions, date_conditions)
+                for rule, description_conditions in rules.values()
+            ]
+
+            for statement, params in compiled_rules:
+                cursor = self.db.execute(statement, params)
+                categorised_count += cursor.rowcount
 
             self.db.commit()
             return categorised_count
@@ -973,90 +1272,42 @@ class TransactionModel:
             start_date = (transaction.date - timedelta(days=window_days)).isoformat()
             end_date = (transaction.date + timedelta(days=window_days)).isoformat()
             
-            # Determine withdrawal/deposit amounts
-            withdrawal = float(abs(transaction.amount)) if transaction.amount < 0 else 0.0
-            deposit = float(transaction.amount) if transaction.amount > 0 else 0.0
-            
-            # Build the description as it would appear in the database
-            description = transaction.payee + (f" - {transaction.memo}" if transaction.memo else '')
+            withdrawal, deposit = _split_amount(transaction.amount)
             
             # Query for matching transactions in the same account
             cursor = self.db.execute("""
-                SELECT COUNT(*) FROM transactions
-                WHERE date BETWEEN ? AND ?
-                AND ABS(withdrawal - ?) < 0.01  -- Use small epsilon for float comparison
-                AND ABS(deposit - ?) < 0.01
-                AND description = ?
-                AND account = ?
-            """, (start_date, end_date, withdrawal, deposit, description, account_id))
+                SELECT EXISTS(
+                    SELECT 1 FROM transactions
+                    WHERE date BETWEEN ? AND ?
+                    AND withdrawal_cents = ?
+                    AND deposit_cents = ?
+                    AND description = ?
+                    AND account = ?
+                    LIMIT 1
+                )
+            """, (start_date, end_date, _to_cents(withdrawal), _to_cents(deposit), transaction.description, account_id))
             
-            count = cursor.fetchone()[0]
-            return count > 0
+            return cursor.fetchone()[0] > 0
             
         except Exception as e:
             return False
         
-    def detect_internal_transfers(self) -> bool:
+    def detect_internal_transfers(self, since: Optional[datetime] = None) -> bool:
         """
         Detect and mark internal transfers between bank accounts.
         Looks for matching amounts (one positive, one negative) on the same day or next day.
         
+        Args:
+            since: Only consider transactions on or after this date. Omit it
+                   for a full scan of the history, e.g. to backfill matches.
+        
         Returns:
             bool: True if successful, False if error occurred
         """
         try:
             self.db.execute("BEGIN TRANSACTION")
             
-            # Get all bank account IDs
-            cursor = self.db.execute("""
-                SELECT id FROM categories 
-                WHERE is_bank_account = 1
-                AND category_type = ?
-            """, (CategoryType.TRANSACTION.value,))
-            
-            bank_accounts = [row[0] for row in cursor]
-            
-            # Look for potential transfers between accounts
-            for account_id in bank_accounts:
-                # Get unmatched transactions for this account
-                cursor = self.db.execute("""
-                    SELECT id, date, withdrawal, deposit 
-                    FROM transactions
-                    WHERE account = ?
-                    AND is_matched = 0
-                    ORDER BY date
-                """, (account_id,))
-                
-                for trans_id, date, withdrawal, deposit in cursor.fetchall():
-                    amount = deposit - withdrawal  # Net amount
-                    
-                    if amount == 0:
-                        continue  # Skip zero-amount transactions
-                    
-                    # Look for matching opposite transaction in other accounts
-                    date_obj = datetime.fromisoformat(date)
-                    next_day = (date_obj + timedelta(days=1)).isoformat()
-                    
-                    # Find matching transaction with opposite amount
-                    match_cursor = self.db.execute("""
-                        SELECT id 
-                        FROM transactions
-                        WHERE account != ?
-                        AND date BETWEEN ? AND ?
-                        AND ABS((deposit - withdrawal) + ?) < 0.01
-                        AND is_matched = 0
-                        LIMIT 1
-                    """, (account_id, date, next_day, amount))
-                    
-                    match = match_cursor.fetchone()
-                    if match:
-                        # Mark both transactions as matched internal transfers
-                        self.db.execute("""
-                            UPDATE transactions
-                            SET is_matched = 1,
-                                is_internal_transfer = 1
-                            WHERE id IN (?, ?)
-                        """, (trans_id, match[0]))
+            self._mark_internal_transfers(since)
             
             self.db.execute("COMMIT")
             return True
@@ -1065,6 +1316,85 @@ class TransactionModel:
             self.db.execute("ROLLBACK")
             return False
 
+    def _transfer_window_start(self, transactions: List[QIFTransaction | CSVTransaction]) -> Optional[datetime]:
+        """
+        Earliest date an import's transactions can pair with as internal transfers.
+        
+        Transfers are matched on the same or next day, so a week before the
+        earliest imported transaction covers every pair involving the import.
+        
+        Args:
+            transactions: The imported transactions
+            
+        Returns:
+            Optional[datetime]: Start of the window, or None for an empty import
+        """
+        if not transactions:
+            return None
+        return min(trans.date for trans in transactions) - timedelta(days=7)
+
+    def _mark_internal_transfers(self, since: Optional[datetime] = None):
+        """
+        Mark matching transfer pairs within the caller's transaction.
+        
+        Used by detect_internal_transfers, and by the imports so that the new
+        rows and their transfer matches are committed together.
+        
+        Args:
+            since: Only consider transactions on or after this date (all if None)
+        """
+        params = [CategoryType.TRANSACTION.value]
+        since_filter = ""
+        if since is not None:
+            # The second transaction is never before the first, so bounding
+            # the first bounds both
+            since_filter = "AND t1.date >= ?"
+            params.append(since.isoformat())
+        
+        # Find every candidate pair in one self-join: an unmatched, non-zero
+        # transaction in a bank account, and an unmatched transaction with
+        # the opposite amount in another account on the same or next day.
+        # The opposite amount is compared on the cents columns as the
+        # matching row stores it, and the next day is computed by SQLite
+        # in the same ISO format the dates are stored in.
+        cursor = self.db.execute(f"""
+            SELECT t1.id, t2.id
+            FROM categories a
+            JOIN transactions t1 ON t1.account = a.id
+            JOIN transactions t2
+                ON t2.account != t1.account
+                AND t2.date BETWEEN t1.date
+                    AND strftime('%Y-%m-%dT%H:%M:%S', t1.date, '+1 day')
+                AND t2.withdrawal_cents = MAX(t1.deposit_cents - t1.withdrawal_cents, 0)
+                AND t2.deposit_cents = MAX(t1.withdrawal_cents - t1.deposit_cents, 0)
+                AND t2.is_matched = 0
+            WHERE a.is_bank_account = 1
+            AND a.category_type = ?
+            AND t1.is_matched = 0
+            AND t1.deposit_cents != t1.withdrawal_cents
+            {since_filter}
+            ORDER BY a.rowid, t1.date, t1.id, t2.date, t2.id
+        """, params)
+        
+        # Pair greedily in account and date order, so each transaction is
+        # matched at most once and earlier transactions get first pick
+        matched = set()
+        pairs = []
+        for trans_id, match_id in cursor:
+            if trans_id in matched or match_id in matched:
+                continue
+            matched.add(trans_id)
+            matched.add(match_id)
+            pairs.append((trans_id, match_id))
+        
+        # Mark both transactions of each pair as matched internal transfers
+        self.db.executemany("""
+            UPDATE transactions
+            SET is_matched = 1,
+                is_internal_transfer = 1
+            WHERE id IN (?, ?)
+        """, pairs)
+
     def find_database_duplicates(self, transactions: List[QIFTransaction], window_days: int = 3) -> List[Dict]:
         """
         Find potential duplicate transactions in the database.
@@ -1083,38 +1413,39 @@ class TransactionModel:
         """
         duplicates = []
         
+        if not transactions:
+            return duplicates
+        
         try:
-            for trans in transactions:
-                # Calculate date range for checking
-                start_date = (trans.date - timedelta(days=window_days)).isoformat()
-                end_date = (trans.date + timedelta(days=window_days)).isoformat()
-                
-                # Determine withdrawal/deposit amounts
-                withdrawal = float(abs(trans.amount)) if trans.amount < 0 else 0.0
-                deposit = float(trans.amount) if trans.amount > 0 else 0.0
-                
-                # Build description as it would appear in the database
-                description = trans.payee + (f" - {trans.memo}" if trans.memo else '')
+            amounts = [_split_amount_cents(trans.amount) for trans in transactions]
+            
+            try:
+                self._stage_incoming_transactions(transactions, amounts, window_days)
                 
-                # Query for matching transactions
+                # Count the matches for every transaction in one query
                 cursor = self.db.execute("""
-                    SELECT COUNT(*) 
-                    FROM transactions
-                    WHERE date BETWEEN ? AND ?
-                    AND ABS(withdrawal - ?) < 0.01  -- Use small epsilon for float comparison
-                    AND ABS(deposit - ?) < 0.01
-                    AND description = ?
-                """, (start_date, end_date, withdrawal, deposit, description))
-                
-                match_count = cursor.fetchone()[0]
-                
-                if match_count > 0:
-                    duplicates.append({
-                        'transaction': trans,
-                        'count': match_count,
-                        # Generate a simple group ID based on date and amount
-                        'group_id': f"{trans.date.strftime('%Y%m%d')}_{abs(trans.amount)}"
-                    })
+                    SELECT i.idx, COUNT(*)
+                    FROM incoming_transactions i
+                    JOIN transactions t
+                        ON t.description = i.description
+                        AND t.date BETWEEN i.start_date AND i.end_date
+                        AND t.withdrawal_cents = i.withdrawal_cents
+                        AND t.deposit_cents = i.deposit_cents
+                    GROUP BY i.idx
+                    ORDER BY i.idx
+                """)
+                match_counts = cursor.fetchall()
+            finally:
+                self.db.execute("DELETE FROM incoming_transactions")
+            
+            for index, match_count in match_counts:
+                trans = transactions[index]
+                duplicates.append({
+                    'transaction': trans,
+                    'count': match_count,
+                    # Generate a simple group ID based on date and amount
+                    'group_id': f"{trans.date.strftime('%Y%m%d')}_{abs(trans.amount)}"
+                })
         
         except Exception as e:
             pass  # Error checking duplicates
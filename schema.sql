@@ -27,6 +27,8 @@ CREATE TABLE IF NOT EXISTS transactions (
     is_internal_transfer BOOLEAN DEFAULT 0,
     balance DECIMAL(15,2),
     transaction_id TEXT,
+    withdrawal_cents INTEGER,   -- withdrawal in whole cents, for exact matching
+    deposit_cents INTEGER,      -- deposit in whole cents, for exact matching
     FOREIGN KEY (category_id) REFERENCES categories (id)
 );
 
@@ -43,6 +45,10 @@ ON transactions(is_hidden, is_internal_transfer, category_id, date DESC);
 CREATE INDEX IF NOT EXISTS idx_transactions_search 
 ON transactions(description, account);
 
+-- Case-insensitive prefix matching (LIKE 'text%') for auto-categorisation rules
+CREATE INDEX IF NOT EXISTS idx_transactions_description_nocase 
+ON transactions(description COLLATE NOCASE);
+
 CREATE INDEX IF NOT EXISTS idx_transactions_uncategorised 
 ON transactions(category_id, is_internal_transfer, is_hidden, date DESC);
 
@@ -56,6 +62,10 @@ ON transactions(account, date DESC, is_hidden);
 CREATE INDEX IF NOT EXISTS idx_transactions_category_filter 
 ON transactions(category_id, date DESC, is_hidden);
 
+-- Internal transfer detection scans each account's unmatched rows by date
+CREATE INDEX IF NOT EXISTS idx_transactions_account_unmatched 
+ON transactions(account, is_matched, date);
+
 -- Covering index for common queries to avoid table lookups
 CREATE INDEX IF NOT EXISTS idx_transactions_covering 
 ON transactions(date, is_hidden, is_internal_transfer, category_id, account, id, description, withdrawal, deposit, is_tax_deductible, is_matched);
@@ -79,6 +89,7 @@ CREATE TABLE IF NOT EXISTS auto_categorisation_rule_descriptions (
     operator TEXT,        -- NULL for first condition, 'AND' or 'OR' for subsequent
     description_text TEXT NOT NULL,
     case_sensitive BOOLEAN NOT NULL DEFAULT 0,
+    match_type TEXT NOT NULL DEFAULT 'contains',  -- 'contains', 'starts_with', 'ends_with' or 'equals'
     sequence INTEGER NOT NULL,  -- Order of conditions
     FOREIGN KEY (rule_id) REFERENCES auto_categorisation_rules (id) ON DELETE CASCADE
 );
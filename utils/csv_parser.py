@@ -7,10 +7,22 @@ them into transaction objects for import into the financial manager.
 
 import csv
 from datetime import datetime
+from itertools import pairwise
 from decimal import Decimal
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+# Header keywords for column mapping detection. Matched as substrings of the
+# lowercased header, except the *_HEADERS sets which must match exactly.
+DATE_KEYWORDS = ('date', 'transaction date', 'posting date')
+DESCRIPTION_KEYWORDS = ('description', 'payee', 'narrative', 'details', 'transaction details')
+AMOUNT_HEADERS = frozenset({'amount', 'transaction amount'})
+DEBIT_KEYWORDS = ('debit', 'withdrawal', 'out')
+CREDIT_KEYWORDS = ('credit', 'deposit', 'in')
+BALANCE_KEYWORDS = ('balance', 'running balance', 'account balance')
+REFERENCE_KEYWORDS = ('reference', 'transaction id', 'ref', 'id')
+CATEGORY_HEADERS = frozenset({'category', 'type', 'transaction type'})
+
 @dataclass
 class CSVTransaction:
     """Represents a transaction from a CSV file"""
@@ -26,13 +38,33 @@ class CSVTransaction:
 class CSVParser:
     """Parser for CSV (Comma Separated Values) bank export files"""
     
+    # Common CSV date formats, in order of preference
+    DATE_FORMATS = (
+        '%d/%m/%Y',    # DD/MM/YYYY (Australian standard)
+        '%d-%m-%Y',    # DD-MM-YYYY
+        '%Y-%m-%d',    # YYYY-MM-DD (ISO format)
+        '%m/%d/%Y',    # MM/DD/YYYY (US format)
+        '%d/%m/%y',    # DD/MM/YY
+        '%d-%m-%y',    # DD-MM-YY
+        '%Y/%m/%d',    # YYYY/MM/DD
+        '%d %b %Y',    # DD Mon YYYY (e.g., "01 Jan 2024")
+        '%d %B %Y',    # DD Month YYYY (e.g., "01 January 2024")
+    )
+    
+    # Column mappings already detected, keyed by the header row. Exports
+    # from the same bank share a header row, so detection runs once per format.
+    _MAPPING_CACHE: Dict[tuple, Dict[str, str]] = {}
+    
     def __init__(self):
         self.transactions: List[CSVTransaction] = []
         self.column_mapping: Dict[str, str] = {}
+        self._column_index: Dict[str, int] = {}
+        self._date_format: Optional[str] = None
         
     def parse_file(self, file_path: str) -> List[CSVTransaction]:
         """Parse a CSV file and return list of transactions"""
         self.transactions = []
+        self._date_format = None
         
         with open(file_path, 'r', encoding='utf-8') as file:
             # Try to detect delimiter
@@ -42,13 +74,23 @@ class CSVParser:
             sniffer = csv.Sniffer()
             delimiter = sniffer.sniff(sample).delimiter
             
-            # Read CSV with detected delimiter
-            reader = csv.DictReader(file, delimiter=delimiter)
+            # Read CSV with detected delimiter. Rows are read as plain lists
+            # and indexed by position, rather than building a dict per row.
+            reader = csv.reader(file, delimiter=delimiter)
+            fieldnames = next(reader, None)
             
             # Auto-detect column mapping from headers
-            self._detect_column_mapping(reader.fieldnames)
+            self._detect_column_mapping(fieldnames)
+            
+            # Position of each mapped column (the last one, if a header repeats)
+            positions = {name: i for i, name in enumerate(fieldnames)}
+            self._column_index = {
+                field: positions[header] for field, header in self.column_mapping.items()
+            }
             
             for row in reader:
+                if not row:
+                    continue
                 transaction = self._parse_row(row)
                 if transaction:
                     self.transactions.append(transaction)
@@ -57,46 +99,62 @@ class CSVParser:
     
     def _detect_column_mapping(self, fieldnames: List[str]) -> None:
         """Auto-detect column mapping based on header names"""
+        key = tuple(fieldnames)
+        cached = self._MAPPING_CACHE.get(key)
+        if cached is not None:
+            self.column_mapping = cached.copy()
+            return
+        
         self.column_mapping = {}
         
-        # Convert headers to lowercase for easier matching
-        headers = [name.lower().strip() for name in fieldnames]
-        original_headers = {name.lower().strip(): name for name in fieldnames}
+        # Convert headers to lowercase for easier matching, normalising each
+        # header name once
+        header_pairs = [(name.lower().strip(), name) for name in fieldnames]
+        original_headers = dict(header_pairs)
         
-        for i, header in enumerate(headers):
+        for header, _ in header_pairs:
             # Date column detection
-            if any(date_word in header for date_word in ['date', 'transaction date', 'posting date']):
+            if any(date_word in header for date_word in DATE_KEYWORDS):
                 self.column_mapping['date'] = original_headers[header]
             
             # Description/Payee column detection
-            elif any(desc_word in header for desc_word in ['description', 'payee', 'narrative', 'details', 'transaction details']):
+            elif any(desc_word in header for desc_word in DESCRIPTION_KEYWORDS):
                 self.column_mapping['description'] = original_headers[header]
             
             # Amount columns - handle single amount or debit/credit split
-            elif header in ['amount', 'transaction amount']:
+            elif header in AMOUNT_HEADERS:
                 self.column_mapping['amount'] = original_headers[header]
-            elif any(debit_word in header for debit_word in ['debit', 'withdrawal', 'out']):
+            elif any(debit_word in header for debit_word in DEBIT_KEYWORDS):
                 self.column_mapping['debit'] = original_headers[header]
-            elif any(credit_word in header for credit_word in ['credit', 'deposit', 'in']):
+            elif any(credit_word in header for credit_word in CREDIT_KEYWORDS):
                 self.column_mapping['credit'] = original_headers[header]
             
             # Balance column detection
-            elif any(balance_word in header for balance_word in ['balance', 'running balance', 'account balance']):
+            elif any(balance_word in header for balance_word in BALANCE_KEYWORDS):
                 self.column_mapping['balance'] = original_headers[header]
             
             # Reference/ID column detection
-            elif any(ref_word in header for ref_word in ['reference', 'transaction id', 'ref', 'id']):
+            elif any(ref_word in header for ref_word in REFERENCE_KEYWORDS):
                 self.column_mapping['reference'] = original_headers[header]
             
             # Category column detection (less common in bank exports)
-            elif header in ['category', 'type', 'transaction type']:
+            elif header in CATEGORY_HEADERS:
                 self.column_mapping['category'] = original_headers[header]
+        
+        self._MAPPING_CACHE[key] = self.column_mapping.copy()
+    
+    def _get_field(self, row: List[str], field: str) -> str:
+        """Get a mapped field's value from a row ('' if the column is not mapped)"""
+        index = self._column_index.get(field)
+        if index is None:
+            return ''
+        return row[index].strip()
     
-    def _parse_row(self, row: Dict[str, str]) -> Optional[CSVTransaction]:
+    def _parse_row(self, row: List[str]) -> Optional[CSVTransaction]:
         """Parse a single CSV row into a CSVTransaction"""
         try:
             # Parse date
-            date_str = row.get(self.column_mapping.get('date', ''), '').strip()
+            date_str = self._get_field(row, 'date')
             if not date_str:
                 return None
             
@@ -108,19 +166,19 @@ class CSVParser:
                 return None
             
             # Parse description/payee
-            description = row.get(self.column_mapping.get('description', ''), '').strip()
+            description = self._get_field(row, 'description')
             
             # Parse balance
             balance = None
-            balance_str = row.get(self.column_mapping.get('balance', ''), '').strip()
+            balance_str = self._get_field(row, 'balance')
             if balance_str:
                 balance = self._parse_decimal(balance_str)
             
             # Parse reference/transaction ID
-            transaction_id = row.get(self.column_mapping.get('reference', ''), '').strip() or None
+            transaction_id = self._get_field(row, 'reference') or None
             
             # Parse category if available
-            category = row.get(self.column_mapping.get('category', ''), '').strip() or None
+            category = self._get_field(row, 'category') or None
             
             return CSVTransaction(
                 date=date,
@@ -136,11 +194,11 @@ class CSVParser:
         except Exception:
             return None
     
-    def _parse_amount(self, row: Dict[str, str]) -> Optional[Decimal]:
+    def _parse_amount(self, row: List[str]) -> Optional[Decimal]:
         """Parse amount from either single amount column or debit/credit columns"""
         # Try single amount column first
-        if 'amount' in self.column_mapping:
-            amount_str = row.get(self.column_mapping['amount'], '').strip()
+        if 'amount' in self._column_index:
+            amount_str = self._get_field(row, 'amount')
             if amount_str:
                 return self._parse_decimal(amount_str)
         
@@ -148,13 +206,13 @@ class CSVParser:
         debit_amount = Decimal('0')
         credit_amount = Decimal('0')
         
-        if 'debit' in self.column_mapping:
-            debit_str = row.get(self.column_mapping['debit'], '').strip()
+        if 'debit' in self._column_index:
+            debit_str = self._get_field(row, 'debit')
             if debit_str:
                 debit_amount = self._parse_decimal(debit_str) or Decimal('0')
         
-        if 'credit' in self.column_mapping:
-            credit_str = row.get(self.column_mapping['credit'], '').strip()
+        if 'credit' in self._column_index:
+            credit_str = self._get_field(row, 'credit')
             if credit_str:
                 credit_amount = self._parse_decimal(credit_str) or Decimal('0')
         
@@ -167,24 +225,21 @@ class CSVParser:
     def _parse_date(self, date_str: str) -> datetime:
         """Parse CSV date format"""
         try:
-            # Handle common CSV date formats
-            formats = [
-                '%d/%m/%Y',    # DD/MM/YYYY (Australian standard)
-                '%d-%m-%Y',    # DD-MM-YYYY
-                '%Y-%m-%d',    # YYYY-MM-DD (ISO format)
-                '%m/%d/%Y',    # MM/DD/YYYY (US format)
-                '%d/%m/%y',    # DD/MM/YY
-                '%d-%m-%y',    # DD-MM-YY
-                '%Y/%m/%d',    # YYYY/MM/DD
-                '%d %b %Y',    # DD Mon YYYY (e.g., "01 Jan 2024")
-                '%d %B %Y',    # DD Month YYYY (e.g., "01 January 2024")
-            ]
-            
-            for fmt in formats:
+            # A file uses one date format throughout, so the format that
+            # parsed the previous row is tried first
+            if self._date_format:
+                try:
+                    return datetime.strptime(date_str, self._date_format)
+                except ValueError:
+                    pass
+            
+            for fmt in self.DATE_FORMATS:
                 try:
-                    return datetime.strptime(date_str, fmt)
+                    date = datetime.strptime(date_str, fmt)
                 except ValueError:
                     continue
+                self._date_format = fmt
+                return date
             
             raise ValueError(f"Unrecognised date format: {date_str}")
         except ValueError:
@@ -226,13 +281,12 @@ class CSVParser:
         """Validate that balance progression makes mathematical sense"""
         warnings = []
         
-        # Sort transactions by date
-        sorted_transactions = sorted(self.transactions, key=lambda t: t.date)
+        # Sort transactions by date, unless the file is already in date order
+        sorted_transactions = self.transactions
+        if any(later.date < earlier.date for earlier, later in pairwise(sorted_transactions)):
+            sorted_transactions = sorted(sorted_transactions, key=lambda t: t.date)
         
-        for i in range(1, len(sorted_transactions)):
-            current = sorted_transactions[i]
-            previous = sorted_transactions[i-1]
-            
+        for previous, current in pairwise(sorted_transactions):
             # Skip if either transaction doesn't have balance
             if current.balance is None or previous.balance is None:
                 continue
@@ -9,6 +9,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from functools import cached_property
 
 @dataclass
 class QIFTransaction:
@@ -20,41 +21,64 @@ class QIFTransaction:
     category: Optional[str] = None
     account: Optional[str] = None
 
+    @cached_property
+    def description(self) -> str:
+        """Description as stored in the database (payee and memo combined)"""
+        return self.payee + (f" - {self.memo}" if self.memo else '')
+
 class QIFParser:
     """Parser for QIF (Quicken Interchange Format) files"""
     
+    # Common QIF date formats, in order of preference
+    DATE_FORMATS = (
+        '%d/%m/%Y', '%m/%d/%Y',  # Standard formats
+        '%d/%m/%y', '%m/%d/%y',  # Two-digit year formats
+        '%Y-%m-%d'               # ISO format
+    )
+    
+    # QIF field code -> (transaction key, name of the method that parses its
+    # value, or None to keep the text as is)
+    _FIELD_HANDLERS = {
+        'D': ('date', '_parse_date'),      # Date
+        'T': ('amount', '_parse_amount'),  # Amount
+        'P': ('payee', None),              # Payee
+        'M': ('memo', None),               # Memo
+        'L': ('category', None),           # Category
+        'A': ('account', None),            # Account
+    }
+    
     def __init__(self):
         self.transactions: List[QIFTransaction] = []
         self._current_transaction: Dict = {}
+        self._date_format: Optional[str] = None
     
     def parse_file(self, file_path: str) -> List[QIFTransaction]:
         """Parse a QIF file and return list of transactions"""
         self.transactions = []
         self._current_transaction = {}
+        self._date_format = None
         
+        # Stream the file rather than reading every line into memory first
         with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        # Skip header if present
-        start_idx = 0
-        if lines and lines[0].startswith('!Type:'):
-            start_idx = 1
-        
-        for line in lines[start_idx:]:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line == '^':  # End of transaction
-                if self._current_transaction:
-                    self._process_transaction()
-                    self._current_transaction = {}
-                continue
-            
-            code = line[0]
-            value = line[1:].strip()
-            
-            self._process_field(code, value)
+            for line_number, line in enumerate(file):
+                # Skip header if present
+                if line_number == 0 and line.startswith('!Type:'):
+                    continue
+                
+                line = line.strip()
+                if not line:
+                    continue
+                
+                if line == '^':  # End of transaction
+                    if self._current_transaction:
+                        self._process_transaction()
+                        self._current_transaction = {}
+                    continue
+                
+                code = line[0]
+                value = line[1:].strip()
+                
+                self._process_field(code, value)
         
         # Process last transaction if exists
         if self._current_transaction:
@@ -64,18 +88,12 @@ class QIFParser:
     
     def _process_field(self, code: str, value: str):
         """Process a single QIF field"""
-        if code == 'D':  # Date
-            self._current_transaction['date'] = self._parse_date(value)
-        elif code == 'T':  # Amount
-            self._current_transaction['amount'] = self._parse_amount(value)
-        elif code == 'P':  # Payee
-            self._current_transaction['payee'] = value
-        elif code == 'M':  # Memo
-            self._current_transaction['memo'] = value
-        elif code == 'L':  # Category
-            self._current_transaction['category'] = value
-        elif code == 'A':  # Account
-            self._current_transaction['account'] = value
+        handler = self._FIELD_HANDLERS.get(code)
+        if handler is None:
+            return
+        
+        key, parser = handler
+        self._current_transaction[key] = getattr(self, parser)(value) if parser else value
     
     def _process_transaction(self):
         """Process the current transaction and add it to the list"""
@@ -96,18 +114,21 @@ class QIFParser:
     def _parse_date(self, date_str: str) -> datetime:
         """Parse QIF date format"""
         try:
-            # Handle common QIF date formats
-            formats = [
-                '%d/%m/%Y', '%m/%d/%Y',  # Standard formats
-                '%d/%m/%y', '%m/%d/%y',  # Two-digit year formats
-                '%Y-%m-%d'               # ISO format
-            ]
+            # A file uses one date format throughout, so the format that
+            # parsed the previous transaction is tried first
+            if self._date_format:
+                try:
+                    return datetime.strptime(date_str, self._date_format)
+                except ValueError:
+                    pass
             
-            for fmt in formats:
+            for fmt in self.DATE_FORMATS:
                 try:
-                    return datetime.strptime(date_str, fmt)
+                    date = datetime.strptime(date_str, fmt)
                 except ValueError:
                     continue
+                self._date_format = fmt
+                return date
             
             raise ValueError(f"Unrecognised date format: {date_str}")
         except ValueError: